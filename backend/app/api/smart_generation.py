@@ -17,6 +17,7 @@ class SmartGenerateRequest(BaseModel):
     llm_provider: str = "anthropic"
     override_agent_mode: Optional[str] = None  # Allow manual override
     override_max_iterations: Optional[int] = None  # Allow manual override
+    refresh_cache: bool = False  # Ignore cached LLM responses (regenerate with the same inputs)
 
 class SmartGenerateResponse(BaseModel):
     project_id: str
@@ -78,7 +79,8 @@ async def smart_generate_code(request: SmartGenerateRequest):
             project_id=request.project_id,
             llm_provider=request.llm_provider,
             max_iterations=max_iterations,
-            agent_mode=agent_mode
+            agent_mode=agent_mode,
+            refresh_cache=request.refresh_cache
         )
         
         # Update project with task ID
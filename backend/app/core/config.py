@@ -37,6 +37,14 @@ class Settings(BaseSettings):
     CELERY_BROKER_CONNECTION_MAX_RETRIES: int = 10
     CELERY_WORKER_PREFETCH_MULTIPLIER: int = 1
     
+    # Concurrent requests per LLM provider, shared by all generations in a process
+    LLM_MAX_CONCURRENCY: int = 8
+    
+    # LLM response cache (0 entries disables it)
+    LLM_RESPONSE_CACHE_PATH: str = "cache/llm_responses.sqlite3"
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 2000
+    
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000"]
     
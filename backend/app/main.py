@@ -69,10 +69,15 @@ system_agent = SystemAgent(llm_service)
 integration_agent = IntegrationAgent(llm_service)
 multi_agent_orchestrator = MultiAgentOrchestrator(llm_service)
 
+@app.on_event("shutdown")
+async def close_llm_connections():
+    await llm_service.aclose()
+
 class GenerateRequest(BaseModel):
     project_id: str
     llm_provider: str = "openai"  # openai, anthropic, deepseek
     max_iterations: int = 10
+    refresh_cache: bool = False  # Ignore cached LLM responses (regenerate with the same inputs)
 
 # NUOVO: Modello per il metodo enhanced
 class EnhancedGenerateRequest(BaseModel):
@@ -267,7 +272,8 @@ async def generate_enhanced_v2(request: GenerateRequest):
         task = process_enhanced_code_generation.delay(
             project_id=request.project_id,
             llm_provider=request.llm_provider,
-            max_iterations=request.max_iterations
+            max_iterations=request.max_iterations,
+            refresh_cache=request.refresh_cache
         )
         
         # Aggiorna progetto
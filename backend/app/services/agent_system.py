@@ -265,7 +265,7 @@ Files should be complete and production-ready.
                             elif isinstance(provider, dict) and "provider" in provider:
                                 integrations.append(f"{provider['provider']} cloud integration")
         
-        return list(set(integrations))  # Remove duplicates
+        return list(dict.fromkeys(integrations))  # Remove duplicates, keep order
     
     def _extract_files(self, response: str) -> Dict[str, str]:
         """Estrai i file dalla risposta LLM utilizzando il pattern FILE: ... ```"""
@@ -403,7 +403,6 @@ Be thorough and specific in your analysis, focusing on the most impactful insigh
     def _extract_json(self, response: str) -> Dict[str, Any]:
         """Estrai JSON dalla risposta LLM"""
         import re
-        import json
         
         # Try to find JSON block
         json_pattern = r'```json\s*([\s\S]*?)\s*```'
@@ -5,13 +5,18 @@ import json
 import logging
 import tempfile
 import shutil
+import weakref
 import os  # 🔥 AGGIUNTO import mancante
-from typing import Dict, Any, List, Optional, Tuple
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, List, Optional, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Kept in a project's scratch copy between checks (see CompilationChecker._scratch_workspace)
+SCRATCH_KEEP = frozenset({"node_modules"})
+
 @dataclass
 class CompilationError:
     """Represents a compilation error"""
@@ -77,6 +82,11 @@ class CompilationChecker:
     
     def __init__(self):
         self.timeout = 300  # 5 minutes timeout for compilation
+        
+        # One scratch copy per (check kind, project) reused across iterations, so
+        # installed dependencies survive and nothing is deleted on the event loop
+        self._scratch_root: Optional[Path] = None
+        self._scratch_in_use: Set[Tuple[str, str]] = set()
         logger.info("CompilationChecker initialized")
     
     async def check_compilation(self, project_path: Path, project_name: str) -> CompilationResult:
@@ -117,6 +127,49 @@ class CompilationChecker:
         
         return result
     
+    @asynccontextmanager
+    async def _scratch_workspace(self, kind: str, project_path: Path) -> AsyncIterator[Path]:
+        """
+        Directory holding a fresh copy of the project in "project/".
+        node_modules and venv from the previous check of the same project are kept.
+        """
+        key = (kind, project_path.name)
+        if key in self._scratch_in_use:
+            # The same project is being checked concurrently: throwaway copy as before
+            temp_dir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix="compile_check_"))
+            try:
+                await asyncio.to_thread(shutil.copytree, project_path, temp_dir / "project")
+                yield temp_dir
+            finally:
+                await asyncio.to_thread(shutil.rmtree, temp_dir, True)
+            return
+        
+        self._scratch_in_use.add(key)
+        try:
+            yield await asyncio.to_thread(self._prepare_scratch_workspace, kind, project_path)
+        finally:
+            self._scratch_in_use.discard(key)
+    
+    def _prepare_scratch_workspace(self, kind: str, project_path: Path) -> Path:
+        if self._scratch_root is None:
+            self._scratch_root = Path(tempfile.mkdtemp(prefix="compile_check_"))
+            weakref.finalize(self, shutil.rmtree, str(self._scratch_root), True)
+        
+        workspace = self._scratch_root / kind / project_path.name
+        temp_path = workspace / "project"
+        if temp_path.exists():
+            # Purge the previous copy at the top level only, keeping installed dependencies
+            for child in temp_path.iterdir():
+                if child.name in SCRATCH_KEEP:
+                    continue
+                if child.is_dir() and not child.is_symlink():
+                    shutil.rmtree(child)
+                else:
+                    child.unlink()
+        
+        shutil.copytree(project_path, temp_path, dirs_exist_ok=True)
+        return workspace
+    
     def _detect_project_type(self, project_path: Path) -> str:
         """Detect the type of project to determine compilation strategy"""
         
@@ -170,12 +223,11 @@ class CompilationChecker:
                 ))
                 return CompilationResult("node", False, errors, warnings, build_output, False, 0.0)
             
-            # Create temporary directory for safe compilation
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir) / "project"
-                shutil.copytree(project_path, temp_path)
+            # Scratch copy of the project for safe compilation
+            async with self._scratch_workspace("node", project_path) as temp_dir:
+                temp_path = temp_dir / "project"
                 
-                # Install dependencies
+                # Install dependencies (incremental when node_modules was kept)
                 install_result = await self._run_command(
                     ["npm", "install"],
                     cwd=temp_path,
@@ -257,13 +309,12 @@ class CompilationChecker:
             # Check if requirements.txt exists
             requirements_txt = project_path / "requirements.txt"
             
-            # Create temporary directory for safe compilation
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir) / "project"
-                shutil.copytree(project_path, temp_path)
+            # Scratch copy of the project for safe compilation
+            async with self._scratch_workspace("python", project_path) as temp_dir:
+                temp_path = temp_dir / "project"
                 
-                # Create virtual environment
-                venv_path = Path(temp_dir) / "venv"
+                # Create virtual environment (reused from the previous check if present)
+                venv_path = temp_dir / "venv"
                 venv_result = await self._run_command(
                     ["python", "-m", "venv", str(venv_path)],
                     timeout=60
@@ -420,10 +471,9 @@ class CompilationChecker:
                                     "Docker build check skipped - Docker not available", 
                                     True, 0.0)
         
-            # Create temporary directory and copy project
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir) / "project"
-                shutil.copytree(project_path, temp_path)
+            # Scratch copy of the project as build context
+            async with self._scratch_workspace("docker", project_path) as temp_dir:
+                temp_path = temp_dir / "project"
                 
                 # Try to build Docker image
                 build_result = await self._run_command(
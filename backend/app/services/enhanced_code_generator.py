@@ -1,15 +1,49 @@
 # backend/app/services/enhanced_code_generator.py
+import asyncio
+import itertools
 import json
 import re
 import logging
 import os
-from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+from typing import AsyncIterator, Awaitable, Dict, Any, Iterable, List, Optional, Tuple, TypeVar
 from pathlib import Path
 
 from app.services.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Maximum number of per-file fixes remembered by fix_issues
+FIX_CACHE_MAX_ENTRIES = 256
+
+# Maximum number of objects whose prompt JSON is kept by _prompt_json
+PROMPT_JSON_CACHE_MAX_ENTRIES = 8
+
+# Per-file fix requests fix_issues keeps in flight at once
+FIX_CONCURRENCY = 4
+
+async def _limited_as_completed(coros: Iterable[Awaitable[T]], limit: int) -> AsyncIterator[T]:
+    """
+    Run at most limit of coros at a time, yielding results as they finish.
+    Coroutines are only created as slots free up; the rest are cancelled if the
+    caller stops iterating or one of them raises.
+    """
+    coros = iter(coros)
+    pending = {asyncio.ensure_future(coro) for coro in itertools.islice(coros, limit)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                next_coro = next(coros, None)
+                if next_coro is not None:
+                    pending.add(asyncio.ensure_future(next_coro))
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
 class EnhancedCodeGenerator:
     """
     Enhanced code generator with improved, more detailed prompts inspired by Lovable's approach.
@@ -19,6 +53,10 @@ class EnhancedCodeGenerator:
     
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
+        # Fixed file content keyed by (file, content, issues) signature
+        self._fix_cache: Dict[str, str] = {}
+        # Serialized prompt JSON keyed by object id (object kept to pin the id)
+        self._prompt_json_cache: Dict[int, Tuple[Any, str]] = {}
         logger.info("EnhancedCodeGenerator initialized with improved prompts")
     
     async def generate_complete_project_enhanced(self,
@@ -206,7 +244,7 @@ Generate a complete, production-ready {project_type} application with these spec
 
 ## Architecture Plan
 ```json
-{json.dumps(architecture_plan, indent=2)}
+{self._prompt_json(architecture_plan)}
 ```
 
 ## Complete Requirements
@@ -309,6 +347,21 @@ Generate a complete, professional-quality application that fully implements all
 
         return prompt
 
+    def _prompt_json(self, data: Any) -> str:
+        """
+        Indented JSON for prompts, serialized once per object.
+        Requirements and architecture plans are not mutated once prompts are built.
+        """
+        cached = self._prompt_json_cache.get(id(data))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        
+        serialized = json.dumps(data, indent=2)
+        if len(self._prompt_json_cache) >= PROMPT_JSON_CACHE_MAX_ENTRIES:
+            self._prompt_json_cache.pop(next(iter(self._prompt_json_cache)))
+        self._prompt_json_cache[id(data)] = (data, serialized)
+        return serialized
+    
     def _format_features_detailed(self, features: List[Any]) -> str:
         """Format features with detailed implementation requirements"""
         if not features:
@@ -798,7 +851,7 @@ This application was generated based on your specific requirements. You can cust
         prompt = f"""
         Create a detailed architecture plan for this project:
         
-        {json.dumps(requirements, indent=2)}
+        {self._prompt_json(requirements)}
         
         The plan should include:
         1. Overall architecture pattern (MVC, Component-based, etc.)
@@ -911,15 +964,16 @@ This application was generated based on your specific requirements. You can cust
         
         base_focus = iteration_focus.get(iteration, ["code_quality"])
         
-        # Aggiungi focus specifici basati sui requisiti
-        if "authentication" in str(requirements).lower():
+        # Aggiungi focus specifici basati sui requisiti (testo calcolato una sola volta)
+        req_text = str(requirements).lower()
+        if "authentication" in req_text:
             base_focus.append("security")
-        if "database" in str(requirements).lower():
+        if "database" in req_text:
             base_focus.append("performance")
-        if "api" in str(requirements).lower():
+        if "api" in req_text:
             base_focus.append("api_design")
         
-        return list(set(base_focus))  # Rimuovi duplicati
+        return list(dict.fromkeys(base_focus))  # Rimuovi duplicati mantenendo l'ordine
 
     async def enhance_code_quality(self,
                                  code_files: Dict[str, str],
@@ -1312,8 +1366,8 @@ This environment is isolated from the main project directory and includes:
         Create a prompt for generating code based on requirements and architecture plan
         """
         # Convert dictionaries to formatted strings
-        req_str = json.dumps(requirements, indent=2)
-        arch_str = json.dumps(architecture_plan, indent=2)
+        req_str = self._prompt_json(requirements)
+        arch_str = self._prompt_json(architecture_plan)
         
         return f"""
         # Architecture-Driven Code Generation
@@ -1393,7 +1447,7 @@ This environment is isolated from the main project directory and includes:
         Create a prompt for generating a specific component within an existing codebase
         """
         # Convert dictionaries to formatted strings
-        req_str = json.dumps(requirements, indent=2)
+        req_str = self._prompt_json(requirements)
         comp_str = json.dumps(component_spec, indent=2)
         
         # Select relevant existing files to provide as context
@@ -1450,9 +1504,11 @@ This environment is isolated from the main project directory and includes:
     async def fix_issues(self,
                       code_files: Dict[str, str],
                       issues: List[Dict[str, Any]],
-                      provider: str) -> Dict[str, str]:
+                      provider: str,
+                      context: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         """
-        Fix specific issues in the code based on testing results or review comments
+        Fix specific issues in the code based on testing results or review comments.
+        Files whose content and issues match an earlier fix reuse it without an LLM call.
         """
         logger.info(f"Fixing {len(issues)} issues in codebase")
         
@@ -1466,6 +1522,7 @@ This environment is isolated from the main project directory and includes:
         
         # For each file with issues, create a targeted prompt
         fixed_files = {}
+        to_fix = []
         
         for file_path, file_issues in issues_by_file.items():
             # Skip files that don't exist in the codebase
@@ -1473,12 +1530,51 @@ This environment is isolated from the main project directory and includes:
                 logger.warning(f"Issues reported for non-existent file: {file_path}")
                 continue
             
-            # Create prompt for fixing this file
             content = code_files.get(file_path, "")
-            prompt = self._create_issue_fixing_prompt(file_path, content, file_issues)
             
-            # Generate fixed code
-            system_prompt = """
+            # Reuse the fix if the same issues were already fixed in this content
+            signature = self._issue_fix_signature(file_path, content, file_issues)
+            if signature in self._fix_cache:
+                logger.info(f"Reusing cached fix for {file_path}")
+                fixed_files[file_path] = self._fix_cache[signature]
+                continue
+            
+            to_fix.append((file_path, signature, content, file_issues))
+        
+        # Files are fixed independently; a few requests run at a time
+        new_fixes = {}
+        async for file_path, signature, fixed_content in _limited_as_completed(
+            (self._fix_file_issues(provider, *item) for item in to_fix), FIX_CONCURRENCY
+        ):
+            if fixed_content is None:
+                logger.warning(f"Failed to get fixed version of {file_path}")
+                continue
+            new_fixes[file_path] = fixed_content
+            self._remember_fix(signature, fixed_content)
+        
+        # Keep the issue order regardless of completion order
+        for file_path, _, _, _ in to_fix:
+            if file_path in new_fixes:
+                fixed_files[file_path] = new_fixes[file_path]
+        
+        # Merge with original files
+        merged_files = code_files.copy()
+        merged_files.update(fixed_files)
+        
+        return merged_files
+
+    async def _fix_file_issues(self,
+                               provider: str,
+                               file_path: str,
+                               signature: str,
+                               content: str,
+                               file_issues: List[Dict[str, Any]]) -> Tuple[str, str, Optional[str]]:
+        """Ask the LLM to fix one file; returns (file_path, signature, fixed content or None)"""
+        # Create prompt for fixing this file
+        prompt = self._create_issue_fixing_prompt(file_path, content, file_issues)
+        
+        # Generate fixed code
+        system_prompt = """
             You are an expert software developer tasked with fixing specific issues in code.
             For each issue:
             1. Understand the root cause
@@ -1488,31 +1584,52 @@ This environment is isolated from the main project directory and includes:
             
             Return the complete fixed file, not just the changes.
             """
-            
-            response = await self.llm_service.generate(
-                provider=provider,
-                prompt=prompt,
-                system_prompt=system_prompt
-            )
-            
-            # Extract the fixed file
-            fixed_file = self._extract_files(response)
-            
-            # Check if we got a valid response
-            if file_path in fixed_file:
-                fixed_files[file_path] = fixed_file[file_path]
-            elif len(fixed_file) == 1:
-                # If there's only one file returned, assume it's the one we wanted
-                fixed_files[file_path] = list(fixed_file.values())[0]
-            else:
-                logger.warning(f"Failed to get fixed version of {file_path}")
         
-        # Merge with original files
-        merged_files = dict(code_files)
-        merged_files.update(fixed_files)
+        response = await self.llm_service.generate(
+            provider=provider,
+            prompt=prompt,
+            system_prompt=system_prompt
+        )
         
-        return merged_files
-
+        # Extract the fixed file
+        fixed_file = self._extract_files(response)
+        
+        # Check if we got a valid response
+        if file_path in fixed_file:
+            return file_path, signature, fixed_file[file_path]
+        if len(fixed_file) == 1:
+            # If there's only one file returned, assume it's the one we wanted
+            return file_path, signature, next(iter(fixed_file.values()))
+        return file_path, signature, None
+
+    def _issue_fix_signature(self,
+                             file_path: str,
+                             content: str,
+                             issues: List[Dict[str, Any]]) -> str:
+        """
+        Signature of a fix request: the file, its exact content and its normalized issues
+        """
+        digest = hashlib.sha256()
+        digest.update(file_path.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(content.encode("utf-8")).digest())
+        normalized_issues = sorted(
+            f"{issue.get('type', issue.get('category', ''))}|{issue.get('line', '')}|{str(issue.get('message', ''))[:200]}"
+            for issue in issues
+        )
+        for normalized_issue in normalized_issues:
+            digest.update(b"\0")
+            digest.update(normalized_issue.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _remember_fix(self, signature: str, fixed_content: str):
+        """
+        Store a fix, evicting the oldest entry once the cache is full
+        """
+        if len(self._fix_cache) >= FIX_CACHE_MAX_ENTRIES:
+            self._fix_cache.pop(next(iter(self._fix_cache)))
+        self._fix_cache[signature] = fixed_content
+    
     def _create_issue_fixing_prompt(self,
                                  file_path: str,
                                  content: str,
@@ -1726,7 +1843,7 @@ This environment is isolated from the main project directory and includes:
         {json.dumps(database_schema, indent=2) if database_schema else 'Design appropriate schema'}
         
         ## Complete Project Requirements
-        {json.dumps(requirements, indent=2)}
+        {self._prompt_json(requirements)}
         
         ## Instructions
         
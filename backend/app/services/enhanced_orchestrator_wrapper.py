@@ -1,16 +1,86 @@
 # backend/app/services/enhanced_orchestrator_wrapper.py
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from pathlib import Path
 
 from app.services.llm_service import LLMService
 from app.services.code_generator import CodeGenerator
 from app.services.test_agent import TestAgent
 from app.services.unified_orchestration_manager import UnifiedOrchestrationManager
+from app.services.llm_response_cache import LLMResponseCache
+
+try:
+    from watchfiles import awatch
+except ImportError:  # optional, the stop file is polled otherwise
+    awatch = None
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks for a STOP_REQUESTED file when watchfiles is unavailable
+STOP_POLL_INTERVAL = 0.5
+# Milliseconds watchfiles groups filesystem events before reporting them
+STOP_WATCH_DEBOUNCE_MS = 100
+
+# "<name> component/service/controller/model/module" mentions in architecture analyses
+_COMPONENT_RE = re.compile(r'(\w+)(?=\s+(?:component|service|controller|model|module))', re.IGNORECASE)
+
+# Design patterns recognised in architecture analyses, in reporting order.
+# Matched as substrings (like "Adapters"), case-insensitively, in a single scan.
+DESIGN_PATTERNS = (
+    "MVC", "MVP", "MVVM", "Repository", "Factory", "Observer",
+    "Singleton", "Strategy", "Command", "Decorator", "Adapter"
+)
+_DESIGN_PATTERN_RE = re.compile("|".join(DESIGN_PATTERNS), re.IGNORECASE)
+
+# Sentences mentioning any of these are taken as architecture recommendations
+_RECOMMENDATION_RE = re.compile(r'recommend|suggest|should|consider|use', re.IGNORECASE)
+
+# Keywords looked up in the lowercased requirements; longer alternatives first so
+# "authentication" is matched whole (it implies "auth", see _requirement_keywords)
+_REQUIREMENT_KEYWORD_RE = re.compile(
+    r'authentication|auth|real-time|websocket|login|upload|file|search'
+    r'|notification|payment|billing|database|api'
+)
+
+# Architecture analysis prompts; only the requirements JSON varies between calls
+ARCHITECTURE_ANALYSIS_PROMPT = """
+        Analyze the following project requirements and create a comprehensive architecture plan:
+        
+        {requirements_json}
+        
+        Create an architecture plan that includes:
+        1. Overall system architecture pattern
+        2. Component breakdown and responsibilities
+        3. Data flow and integration points
+        4. Technology stack recommendations
+        5. File structure and organization
+        6. Key design patterns to follow
+        7. Scalability considerations
+        8. Security considerations
+        
+        Provide the analysis in JSON format with clear structure.
+        """
+
+ARCHITECTURE_SYSTEM_PROMPT = """
+        You are an expert software architect specializing in modern application design.
+        Analyze the requirements and create a detailed architecture plan that will guide 
+        the enhanced code generation process. Focus on:
+        - Scalability and maintainability
+        - Best practices for the specified technology stack
+        - Clear separation of concerns
+        - Modern architectural patterns
+        - Security and performance considerations
+        """
+
+class GenerationStopped(Exception):
+    """Raised when an in-flight step is cancelled because a stop was requested"""
+
 class EnhancedGeneratorWrapper:
     """
     🔥 ENHANCED GENERATOR WRAPPER - Using Unified Components
@@ -21,15 +91,34 @@ class EnhancedGeneratorWrapper:
     Focus: Simple to moderate projects with architectural analysis and quality enhancement
     """
     
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, response_cache: Optional[LLMResponseCache] = None):
         self.llm_service = llm_service
         self.basic_generator = CodeGenerator(llm_service)  # Fallback
         self.test_agent = TestAgent(llm_service)
         
+        # Architecture plans for identical requirements are answered from here when the
+        # caller passes a cache; without one nothing is persisted
+        self.response_cache = response_cache if response_cache is not None else LLMResponseCache(max_entries=0)
+        
         # 🎯 UNIFIED COMPONENTS
         self.unified_manager = UnifiedOrchestrationManager()
         
-        self.stop_requested = False
+        # Thread-safe stop flag; _stop_event wakes the running generation loop
+        self._stop_request = threading.Event()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Digests of (files, focus) pairs that quality enhancement has already handled
+        self._enhanced_signatures = set()
+        
+        # Keyword hits of the last requirements object seen (same dict every iteration)
+        self._requirements_source: Optional[Dict[str, Any]] = None
+        self._requirements_keywords: set = set()
+        
+        # Requirements with architecture context for the basic generator, and the
+        # (requirements, architecture_plan) objects it was built from
+        self._enhanced_requirements: Optional[Dict[str, Any]] = None
+        self._enhanced_requirements_source: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
         
         # Enhanced Code Generator
         try:
@@ -39,9 +128,29 @@ class EnhancedGeneratorWrapper:
         except ImportError:
             self.enhanced_generator = None
             self.has_enhanced_generator = False
+        
+        # Probed once here instead of catching AttributeError on every first iteration
+        self._has_generate_with_architecture = callable(
+            getattr(self.enhanced_generator, "generate_with_architecture", None)
+        )
+        self._has_generate_complete_project_enhanced = callable(
+            getattr(self.enhanced_generator, "generate_complete_project_enhanced", None)
+        )
             
         logger.info("EnhancedGeneratorWrapper initialized with unified components")
     
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop_request.is_set()
+    
+    @stop_requested.setter
+    def stop_requested(self, value: bool):
+        if value:
+            self._stop_request.set()
+            self._wake_stop_event()
+        else:
+            self._stop_request.clear()
+    
     async def generate_application_with_enhanced_flow(self, 
                                                     requirements: Dict[str, Any],
                                                     provider: str,
@@ -54,10 +163,28 @@ class EnhancedGeneratorWrapper:
         This method focuses on enhanced single-agent generation with architecture analysis,
         while delegating all structure, organization, and validation to unified components.
         """
-        
-        # Check for stop request
-        stop_file = project_path / "STOP_REQUESTED"
-        if stop_file.exists():
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._clear_enhanced_requirements()
+        stop_watcher = asyncio.create_task(self._watch_stop_requests(project_path / "STOP_REQUESTED"))
+        try:
+            return await self._run_enhanced_single_agent_flow(
+                requirements, provider, max_iterations, project_path, progress_callback
+            )
+        finally:
+            stop_watcher.cancel()
+            self._loop = None
+    
+    async def _run_enhanced_single_agent_flow(self,
+                                              requirements: Dict[str, Any],
+                                              provider: str,
+                                              max_iterations: int,
+                                              project_path: Path,
+                                              progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """Iteration loop of generate_application_with_enhanced_flow"""
+        
+        # Check for stop request (later ones arrive through _stop_event)
+        if os.path.exists(os.fspath(project_path / "STOP_REQUESTED")):
             logger.info(f"Stop file found for project {project_path.name}, stopping generation")
             return {"status": "stopped", "reason": "user_requested"}
         
@@ -68,8 +195,22 @@ class EnhancedGeneratorWrapper:
         if not project_name or project_name == project_path.name:
             project_name = f"project_{project_path.name}"
         
+        # 🎯 ARCHITECTURAL ANALYSIS (enhanced generator specialty)
+        # Started first so the LLM round trip overlaps the filesystem setup below
+        if progress_callback:
+            progress_callback(0, 'analyzing_architecture')
+        architecture_task = asyncio.ensure_future(
+            self._analyze_project_architecture(requirements, provider)
+        )
+        
         # 🎯 CREATE UNIFIED STRUCTURE
-        structure = self.unified_manager.create_project_structure(project_path, project_name)
+        try:
+            structure = await asyncio.to_thread(
+                self.unified_manager.create_project_structure, project_path, project_name
+            )
+        except BaseException:
+            architecture_task.cancel()
+            raise
         logger.info(f"🏗️ Unified structure created for: {structure['project_name']}")
         
         # Track project state
@@ -83,20 +224,27 @@ class EnhancedGeneratorWrapper:
             "architecture_analysis_completed": False
         }
         
-        # 🎯 ARCHITECTURAL ANALYSIS (enhanced generator specialty)
-        if progress_callback:
-            progress_callback(0, 'analyzing_architecture')
-        
-        architecture_plan = await self._analyze_project_architecture(requirements, provider)
+        try:
+            architecture_plan = await self._run_until_stopped(architecture_task)
+        except GenerationStopped:
+            logger.info("Stop requested during architecture analysis, interrupting generation")
+            return {"status": "stopped", "reason": "user_requested"}
         project_state["architecture_analysis_completed"] = True
         logger.info("🏛️ Architecture analysis completed")
         
+        # (iteration, errors_for_fixing) of the last validated iteration, so the next
+        # iteration does not have to read them back from the reports directory
+        staged_errors: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        
+        # Content digest of every file as last saved, so unchanged files are not rewritten
+        saved_digests: Dict[str, bytes] = {}
+        
         # Main iteration loop
         for iteration in range(1, max_iterations + 1):
             logger.info(f"🔄 Starting enhanced single-agent iteration {iteration} for {structure['project_name']}")
             
             # Check for stop request
-            if stop_file.exists() or self.stop_requested:
+            if self.stop_requested or self._stop_event.is_set():
                 logger.info("Stop requested, interrupting generation")
                 return {
                     "status": "stopped",
@@ -109,7 +257,7 @@ class EnhancedGeneratorWrapper:
             
             try:
                 # Update current iteration in project.json
-                self._update_current_iteration(project_path, iteration)
+                await self._update_current_iteration(project_path, iteration)
                 
                 # Progress callback
                 if progress_callback:
@@ -119,15 +267,34 @@ class EnhancedGeneratorWrapper:
                 if progress_callback:
                     progress_callback(iteration, 'generating_enhanced_single_agent_code')
                 
-                code_files = await self._generate_code_for_enhanced_single_agent_iteration(
-                    requirements, provider, iteration, structure, architecture_plan
-                )
+                previous_errors = None
+                if staged_errors is not None and staged_errors[0] == iteration - 1:
+                    previous_errors = staged_errors[1]
                 
-                # 📁 ORGANIZE AND SAVE (unified system)
-                files_generated, files_modified = self.unified_manager.organize_and_save_files(
-                    structure, code_files, requirements
+                code_files = await self._run_until_stopped(
+                    self._generate_code_for_enhanced_single_agent_iteration(
+                        requirements, provider, iteration, structure, architecture_plan, previous_errors
+                    )
                 )
                 
+                # 📁 ORGANIZE AND SAVE (unified system) - only files changed since the last save
+                file_digests = {
+                    file_path: self._content_digest(content) for file_path, content in code_files.items()
+                }
+                dirty_files = {
+                    file_path: code_files[file_path]
+                    for file_path, digest in file_digests.items()
+                    if saved_digests.get(file_path) != digest
+                }
+                if dirty_files:
+                    files_generated, files_modified = await asyncio.to_thread(
+                        self.unified_manager.organize_and_save_files, structure, dirty_files, requirements
+                    )
+                    saved_digests.update(file_digests)
+                else:
+                    logger.info(f"⏭️ No files changed in iteration {iteration}, skipping save")
+                    files_generated = files_modified = 0
+                
                 logger.info(f"✅ Enhanced single-agent iteration {iteration}: Generated {files_generated} files, modified {files_modified}")
                 
                 # 🔍 VALIDATE (unified system)
@@ -138,6 +305,9 @@ class EnhancedGeneratorWrapper:
                     structure, requirements, iteration
                 )
                 
+                if "errors_for_fixing" in validation_result:
+                    staged_errors = (iteration, validation_result["errors_for_fixing"])
+                
                 # Update project state
                 project_state["iterations_completed"] = iteration
                 project_state["remaining_issues"] = validation_result.get("errors_for_fixing", [])
@@ -174,6 +344,17 @@ class EnhancedGeneratorWrapper:
                 if iteration > 1 and current_errors >= prev_errors:
                     logger.warning(f"⚠️ No progress in enhanced single-agent iteration {iteration}, errors: {current_errors}")
                 
+            except GenerationStopped:
+                logger.info("Stop requested during code generation, interrupting generation")
+                return {
+                    "status": "stopped",
+                    "reason": "user_requested",
+                    "iteration": iteration - 1,
+                    "project_id": project_path.name,
+                    "project_state": project_state,
+                    "output_path": str(structure["project_path"])
+                }
+            
             except Exception as e:
                 logger.error(f"❌ Error in enhanced single-agent iteration {iteration}: {str(e)}")
                 
@@ -213,79 +394,150 @@ class EnhancedGeneratorWrapper:
             "architecture_plan": architecture_plan
         }
     
-    async def _analyze_project_architecture(self, requirements: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    async def _watch_stop_requests(self, stop_file: Path):
+        """Set the stop event once the stop file appears (request_stop() sets it directly)"""
+        stop_file_path = str(stop_file)
+        if self.stop_requested or os.path.exists(stop_file_path):
+            self._stop_event.set()
+            return
+        
+        if awatch is not None:
+            # inotify/kqueue notifications instead of a stat() every poll interval
+            try:
+                async for _ in awatch(os.path.dirname(stop_file_path),
+                                      stop_event=self._stop_event,
+                                      debounce=STOP_WATCH_DEBOUNCE_MS,
+                                      recursive=False):
+                    if os.path.exists(stop_file_path):
+                        self._stop_event.set()
+                        return
+                return  # stop_event was set elsewhere
+            except Exception as e:
+                logger.warning(f"Could not watch {stop_file_path}, polling instead: {e}")
+        
+        while not self._stop_event.is_set():
+            if self.stop_requested or os.path.exists(stop_file_path):
+                self._stop_event.set()
+                break
+            await asyncio.sleep(STOP_POLL_INTERVAL)
+    
+    async def _run_until_stopped(self, coro):
+        """Await coro, cancelling it as soon as a stop is requested"""
+        task = asyncio.ensure_future(coro)
+        stop_wait = asyncio.ensure_future(self._stop_event.wait())
+        try:
+            await asyncio.wait({task, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            stop_wait.cancel()
+        
+        if not task.done():
+            task.cancel()
+            raise GenerationStopped("Generation stopped by user request")
+        return task.result()
+    
+    async def _analyze_project_architecture(self,
+                                            requirements: Dict[str, Any],
+                                            provider: str) -> Dict[str, Any]:
         """
         🏛️ ANALYZE PROJECT ARCHITECTURE
         
         Enhanced Generator specialty: architectural analysis and planning
+        Plans are cached by requirements digest, so unchanged requirements skip the LLM call
         """
+        # Compact canonical JSON as prompt payload
+        try:
+            canonical = json.dumps(requirements, sort_keys=True, default=str)
+            cache_key = self.response_cache.make_key("architecture", provider, requirements)
+        except TypeError:
+            # Keys of mixed types cannot be sorted; analyze anyway, without caching
+            canonical = json.dumps(requirements, default=str)
+            cache_key = None
+        
+        # Only successful analyses are cached; fallbacks are retried next time
+        try:
+            if cache_key is None:
+                return await self._run_architecture_analysis(requirements, provider, canonical)
+            return await self.response_cache.get_or_call(
+                cache_key, lambda: self._run_architecture_analysis(requirements, provider, canonical), model=provider
+            )
+        except Exception as e:
+            logger.error(f"Error in architecture analysis: {e}")
+            return self._create_fallback_architecture_plan(requirements)
+    
+    async def _run_architecture_analysis(self,
+                                         requirements: Dict[str, Any],
+                                         provider: str,
+                                         canonical: str) -> Dict[str, Any]:
+        """Ask the LLM for an architecture plan; errors propagate to _analyze_project_architecture"""
         logger.info("🏛️ Analyzing project architecture with enhanced generator")
         
         # Create architecture analysis prompt
-        analysis_prompt = f"""
-        Analyze the following project requirements and create a comprehensive architecture plan:
-        
-        {json.dumps(requirements, indent=2)}
+        analysis_prompt = ARCHITECTURE_ANALYSIS_PROMPT.format(requirements_json=canonical)
         
-        Create an architecture plan that includes:
-        1. Overall system architecture pattern
-        2. Component breakdown and responsibilities
-        3. Data flow and integration points
-        4. Technology stack recommendations
-        5. File structure and organization
-        6. Key design patterns to follow
-        7. Scalability considerations
-        8. Security considerations
+        response = await self._generate_until_json_block(
+            provider, analysis_prompt, ARCHITECTURE_SYSTEM_PROMPT
+        )
         
-        Provide the analysis in JSON format with clear structure.
+        # Try to extract JSON from response
+        json_payload = self._extract_json_block(response)
+        if json_payload is not None:
+            architecture_plan = json.loads(json_payload)
+        else:
+            # Fallback: create structured plan from text response
+            architecture_plan = {
+                "analysis_type": "enhanced_architecture",
+                "overview": response[:500],
+                "components": self._extract_components_from_text(response),
+                "patterns": self._extract_patterns_from_text(response),
+                "tech_stack": requirements.get("tech_stack", {}),
+                "recommendations": self._extract_recommendations_from_text(response)
+            }
+        
+        # Enhance with project-specific details
+        architecture_plan["project_type"] = requirements.get("project", {}).get("type", "fullstack")
+        architecture_plan["complexity_level"] = self._assess_complexity_level(requirements)
+        architecture_plan["enhanced_features"] = self._identify_enhanced_features(requirements)
+        
+        logger.info(f"✅ Architecture analysis complete: {architecture_plan.get('analysis_type', 'basic')}")
+        return architecture_plan
+    
+    async def _generate_until_json_block(self, provider: str, prompt: str, system_prompt: str) -> str:
         """
-        
-        system_prompt = """
-        You are an expert software architect specializing in modern application design.
-        Analyze the requirements and create a detailed architecture plan that will guide 
-        the enhanced code generation process. Focus on:
-        - Scalability and maintainability
-        - Best practices for the specified technology stack
-        - Clear separation of concerns
-        - Modern architectural patterns
-        - Security and performance considerations
+        Stream a response and stop as soon as its first ```json block is closed,
+        skipping whatever the model writes after it. Without a block the full text is returned.
         """
-        
+        text = ""
+        block_start = -1
+        stream = self.llm_service.generate_stream(provider=provider, prompt=prompt, system_prompt=system_prompt)
         try:
-            response = await self.llm_service.generate(
-                provider=provider,
-                prompt=analysis_prompt,
-                system_prompt=system_prompt
-            )
-            
-            # Try to extract JSON from response
-            import re
-            import json
-            json_match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
-            if json_match:
-                architecture_plan = json.loads(json_match.group(1))
-            else:
-                # Fallback: create structured plan from text response
-                architecture_plan = {
-                    "analysis_type": "enhanced_architecture",
-                    "overview": response[:500],
-                    "components": self._extract_components_from_text(response),
-                    "patterns": self._extract_patterns_from_text(response),
-                    "tech_stack": requirements.get("tech_stack", {}),
-                    "recommendations": self._extract_recommendations_from_text(response)
-                }
-            
-            # Enhance with project-specific details
-            architecture_plan["project_type"] = requirements.get("project", {}).get("type", "fullstack")
-            architecture_plan["complexity_level"] = self._assess_complexity_level(requirements)
-            architecture_plan["enhanced_features"] = self._identify_enhanced_features(requirements)
-            
-            logger.info(f"✅ Architecture analysis complete: {architecture_plan.get('analysis_type', 'basic')}")
-            return architecture_plan
-            
-        except Exception as e:
-            logger.error(f"Error in architecture analysis: {e}")
-            return self._create_fallback_architecture_plan(requirements)
+            async for chunk in stream:
+                # Re-scan a few characters back in case a fence was split across chunks
+                scan_from = max(0, len(text) - 6)
+                text += chunk
+                if block_start == -1:
+                    found = text.find("```json", scan_from)
+                    if found == -1:
+                        continue
+                    block_start = scan_from = found + len("```json")
+                if text.find("```", max(scan_from, block_start)) != -1:
+                    break
+        finally:
+            await stream.aclose()
+        return text
+    
+    def _extract_json_block(self, text: str) -> Optional[str]:
+        """Return the body of the first ```json fenced block, or None if absent"""
+        start = text.find("```json")
+        if start == -1:
+            return None
+        start += len("```json")
+        end = text.find("```", start)
+        if end == -1:
+            return None
+        return text[start:end].strip()
     
     def _assess_complexity_level(self, requirements: Dict[str, Any]) -> str:
         """Assess project complexity level for enhanced generation"""
@@ -293,17 +545,18 @@ class EnhancedGeneratorWrapper:
         tech_stack = requirements.get("tech_stack", {})
         
         complexity_indicators = 0
+        keywords = self._get_requirement_keywords(requirements)
         
         # Count complexity indicators
         if len(features) > 5:
             complexity_indicators += 1
-        if "authentication" in str(requirements).lower():
+        if "authentication" in keywords:
             complexity_indicators += 1
-        if "database" in str(requirements).lower():
+        if "database" in keywords:
             complexity_indicators += 1
         if len(tech_stack) > 3:
             complexity_indicators += 1
-        if "api" in str(requirements).lower():
+        if "api" in keywords:
             complexity_indicators += 1
         
         if complexity_indicators <= 2:
@@ -316,70 +569,65 @@ class EnhancedGeneratorWrapper:
     def _identify_enhanced_features(self, requirements: Dict[str, Any]) -> List[str]:
         """Identify features that benefit from enhanced generation"""
         enhanced_features = []
-        req_str = str(requirements).lower()
+        keywords = self._get_requirement_keywords(requirements)
         
-        if "real-time" in req_str or "websocket" in req_str:
+        if "real-time" in keywords or "websocket" in keywords:
             enhanced_features.append("real_time_communication")
-        if "auth" in req_str or "login" in req_str:
+        if "auth" in keywords or "login" in keywords:
             enhanced_features.append("authentication_system")
-        if "upload" in req_str or "file" in req_str:
+        if "upload" in keywords or "file" in keywords:
             enhanced_features.append("file_management")
-        if "search" in req_str:
+        if "search" in keywords:
             enhanced_features.append("search_functionality")
-        if "notification" in req_str:
+        if "notification" in keywords:
             enhanced_features.append("notification_system")
-        if "payment" in req_str or "billing" in req_str:
+        if "payment" in keywords or "billing" in keywords:
             enhanced_features.append("payment_integration")
         
         return enhanced_features
     
+    def _get_requirement_keywords(self, requirements: Dict[str, Any]) -> set:
+        """Keyword hits for requirements, serialized and scanned once per requirements object"""
+        if self._requirements_source is not requirements:
+            self._requirements_source = requirements
+            self._requirements_keywords = self._requirement_keywords(
+                json.dumps(requirements, default=str).lower()
+            )
+        return self._requirements_keywords
+    
+    def _requirement_keywords(self, req_str: str) -> set:
+        """Keywords from _REQUIREMENT_KEYWORD_RE occurring anywhere in req_str, in one scan"""
+        keywords = set(_REQUIREMENT_KEYWORD_RE.findall(req_str))
+        if "authentication" in keywords:
+            keywords.add("auth")
+        return keywords
+    
     def _extract_components_from_text(self, text: str) -> List[str]:
         """Extract main components from architecture analysis text"""
-        import re
-        component_patterns = [
-            r'(\w+)\s+component',
-            r'(\w+)\s+service',
-            r'(\w+)\s+controller',
-            r'(\w+)\s+model',
-            r'(\w+)\s+module'
-        ]
-        
-        components = set()
-        for pattern in component_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            components.update(matches)
-        
+        # One scan for all suffixes; dict.fromkeys keeps first-seen order while deduplicating
+        components = dict.fromkeys(_COMPONENT_RE.findall(text))
         return list(components)[:10]  # Limit to 10 main components
     
     def _extract_patterns_from_text(self, text: str) -> List[str]:
         """Extract design patterns from architecture analysis"""
-        common_patterns = [
-            "MVC", "MVP", "MVVM", "Repository", "Factory", "Observer", 
-            "Singleton", "Strategy", "Command", "Decorator", "Adapter"
-        ]
-        
-        found_patterns = []
-        text_lower = text.lower()
-        for pattern in common_patterns:
-            if pattern.lower() in text_lower:
-                found_patterns.append(pattern)
+        hits = {match.lower() for match in _DESIGN_PATTERN_RE.findall(text)}
+        found_patterns = [pattern for pattern in DESIGN_PATTERNS if pattern.lower() in hits]
         
         return found_patterns or ["MVC", "Repository"]  # Default patterns
     
     def _extract_recommendations_from_text(self, text: str) -> List[str]:
         """Extract recommendations from architecture analysis"""
         # Simple extraction of sentences containing recommendation keywords
-        recommendation_keywords = ["recommend", "suggest", "should", "consider", "use"]
-        sentences = text.split('.')
-        
         recommendations = []
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in recommendation_keywords):
+        for sentence in text.split('.'):
+            if _RECOMMENDATION_RE.search(sentence):
                 clean_sentence = sentence.strip()
                 if len(clean_sentence) > 20:  # Filter out very short sentences
                     recommendations.append(clean_sentence)
+                    if len(recommendations) == 5:  # Limit to 5 recommendations
+                        break
         
-        return recommendations[:5]  # Limit to 5 recommendations
+        return recommendations
     
     def _create_fallback_architecture_plan(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
         """Create basic architecture plan if analysis fails"""
@@ -407,11 +655,13 @@ class EnhancedGeneratorWrapper:
                                                                provider: str,
                                                                iteration: int,
                                                                structure: Dict[str, Path],
-                                                               architecture_plan: Dict[str, Any]) -> Dict[str, str]:
+                                                               architecture_plan: Dict[str, Any],
+                                                               previous_errors: Optional[List[Dict[str, Any]]] = None) -> Dict[str, str]:
         """
         🔧 GENERATE CODE FOR ENHANCED SINGLE-AGENT ITERATION
         
         This method focuses on enhanced single-agent code generation with architectural guidance.
+        previous_errors, when the caller still has them, saves re-reading the last report.
         """
         logger.info(f"🔧 Generating enhanced single-agent code for iteration {iteration}")
         
@@ -422,8 +672,12 @@ class EnhancedGeneratorWrapper:
             )
         else:
             # Subsequent iterations: load previous and apply intelligent fixes
-            existing_files = self.unified_manager.load_previous_files(structure)
-            previous_errors = self.unified_manager.load_previous_errors(structure, iteration - 1)
+            # Served from the structure manager's cache when validation just read the tree
+            existing_files = await asyncio.to_thread(self.unified_manager.load_previous_files, structure)
+            if previous_errors is None:
+                previous_errors = await asyncio.to_thread(
+                    self.unified_manager.load_previous_errors, structure, iteration - 1
+                )
             
             if previous_errors and existing_files:
                 logger.info(f"🔧 Found {len(previous_errors)} errors from previous iteration")
@@ -445,19 +699,23 @@ class EnhancedGeneratorWrapper:
         
         # Use enhanced generator if available
         if self.has_enhanced_generator:
-            logger.info("⚡ Using Enhanced Generator with architecture plan")
-            try:
-                enhanced_result = await self.enhanced_generator.generate_with_architecture(
-                    requirements=requirements,
-                    architecture_plan=architecture_plan,
-                    provider=provider
-                )
-                
-                if enhanced_result and isinstance(enhanced_result, dict):
-                    logger.info("✅ Enhanced Generator with architecture produced code successfully")
-                    return enhanced_result
+            if self._has_generate_with_architecture:
+                logger.info("⚡ Using Enhanced Generator with architecture plan")
+                try:
+                    enhanced_result = await self.enhanced_generator.generate_with_architecture(
+                        requirements=requirements,
+                        architecture_plan=architecture_plan,
+                        provider=provider
+                    )
                     
-            except AttributeError:
+                    if enhanced_result and isinstance(enhanced_result, dict):
+                        logger.info("✅ Enhanced Generator with architecture produced code successfully")
+                        return enhanced_result
+                        
+                except Exception as e:
+                    logger.warning(f"Enhanced Generator with architecture failed: {e}")
+            
+            elif self._has_generate_complete_project_enhanced:
                 logger.info("Enhanced Generator doesn't have generate_with_architecture method, using standard method")
                 try:
                     enhanced_result = await self.enhanced_generator.generate_complete_project_enhanced(
@@ -471,8 +729,6 @@ class EnhancedGeneratorWrapper:
                         
                 except Exception as e:
                     logger.warning(f"Enhanced Generator standard method failed: {e}")
-            except Exception as e:
-                logger.warning(f"Enhanced Generator with architecture failed: {e}")
         
         # Fallback to basic generator with architecture context
         logger.info("🔧 Using basic generator with architecture context")
@@ -486,14 +742,20 @@ class EnhancedGeneratorWrapper:
                                                             architecture_plan: Dict[str, Any]) -> Dict[str, str]:
         """Generate code using basic generator with architecture context"""
         
-        # Enhance requirements with architecture insights
-        enhanced_requirements = dict(requirements)
-        enhanced_requirements["_architecture_context"] = {
-            "components": architecture_plan.get("components", []),
-            "patterns": architecture_plan.get("patterns", []),
-            "complexity_level": architecture_plan.get("complexity_level", "moderate"),
-            "recommendations": architecture_plan.get("recommendations", [])
-        }
+        # Enhance requirements with architecture insights (built once per requirements/plan pair)
+        source = self._enhanced_requirements_source
+        if source is not None and source[0] is requirements and source[1] is architecture_plan:
+            enhanced_requirements = self._enhanced_requirements
+        else:
+            enhanced_requirements = dict(requirements)
+            enhanced_requirements["_architecture_context"] = {
+                "components": architecture_plan.get("components", []),
+                "patterns": architecture_plan.get("patterns", []),
+                "complexity_level": architecture_plan.get("complexity_level", "moderate"),
+                "recommendations": architecture_plan.get("recommendations", [])
+            }
+            self._enhanced_requirements = enhanced_requirements
+            self._enhanced_requirements_source = (requirements, architecture_plan)
         
         project_type = requirements.get("project", {}).get("type", "fullstack")
         
@@ -555,6 +817,12 @@ class EnhancedGeneratorWrapper:
             requirements, architecture_plan, iteration
         )
         
+        # Skip the LLM round-trip if these exact files were already enhanced with this focus
+        input_signature = self._enhancement_signature(existing_files, enhancement_focus)
+        if existing_files and input_signature in self._enhanced_signatures:
+            logger.info("⏭️ Code unchanged since last quality enhancement with this focus, skipping")
+            return existing_files
+        
         # Use enhanced generator for quality improvements if available
         if self.has_enhanced_generator:
             try:
@@ -564,6 +832,8 @@ class EnhancedGeneratorWrapper:
                     provider=provider
                 )
                 logger.info(f"✅ Enhanced Generator applied quality improvements: {', '.join(enhancement_focus)}")
+                self._enhanced_signatures.add(input_signature)
+                self._enhanced_signatures.add(self._enhancement_signature(enhanced_files, enhancement_focus))
                 return enhanced_files
                 
             except Exception as e:
@@ -574,6 +844,21 @@ class EnhancedGeneratorWrapper:
             requirements, provider, iteration, [], existing_files
         )
 
+    def _content_digest(self, content: str) -> bytes:
+        """Digest of a single file's content"""
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+    
+    def _enhancement_signature(self, code_files: Dict[str, str], focus: List[str]) -> str:
+        """Digest of file contents plus enhancement focus"""
+        digest = hashlib.blake2b(digest_size=16)
+        for file_path in sorted(code_files):
+            digest.update(file_path.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(code_files[file_path].encode("utf-8"))
+            digest.update(b"\0")
+        digest.update("|".join(focus).encode("utf-8"))
+        return digest.hexdigest()
+    
     def _determine_enhancement_focus(self,
                                    requirements: Dict[str, Any],
                                    architecture_plan: Dict[str, Any],
@@ -588,47 +873,56 @@ class EnhancedGeneratorWrapper:
             5: ["maintainability", "scalability"]
         }
         
-        focus_areas = iteration_focus.get(iteration, ["code_quality"])
+        # Insertion-ordered set: duplicates collapse as they are added
+        focus_areas = dict.fromkeys(iteration_focus.get(iteration, ("code_quality",)))
         
         # Add architecture-based focus
         complexity = architecture_plan.get("complexity_level", "moderate")
         if complexity == "complex":
-            focus_areas.extend(["modularization", "separation_of_concerns"])
+            focus_areas["modularization"] = None
+            focus_areas["separation_of_concerns"] = None
         
         enhanced_features = architecture_plan.get("enhanced_features", [])
         if "authentication_system" in enhanced_features:
-            focus_areas.append("security")
+            focus_areas["security"] = None
         if "real_time_communication" in enhanced_features:
-            focus_areas.append("performance")
+            focus_areas["performance"] = None
         
         # Add requirements-based focus
-        req_str = str(requirements).lower()
-        if "api" in req_str:
-            focus_areas.append("documentation")
-        if "database" in req_str:
-            focus_areas.append("data_validation")
+        keywords = self._get_requirement_keywords(requirements)
+        if "api" in keywords:
+            focus_areas["documentation"] = None
+        if "database" in keywords:
+            focus_areas["data_validation"] = None
         
-        return list(set(focus_areas))  # Remove duplicates
+        return list(focus_areas)
     
-    def _update_current_iteration(self, project_path: Path, iteration: int):
-        """Update current iteration in project.json"""
+    async def _update_current_iteration(self, project_path: Path, iteration: int):
+        """Update current iteration in project.json (file I/O runs in a worker thread)"""
         try:
-            project_json_path = project_path / "project.json"
-            if project_json_path.exists():
-                import json
-                with open(project_json_path, 'r') as f:
-                    project_data = json.load(f)
-                
-                project_data["current_iteration"] = iteration
-                project_data["structure_type"] = "unified"
-                project_data["generation_mode"] = "enhanced_single_agent"
-                
-                with open(project_json_path, 'w') as f:
-                    json.dump(project_data, f, indent=2)
+            await asyncio.to_thread(self.unified_manager.update_project_json, project_path, {
+                "current_iteration": iteration,
+                "structure_type": "unified",
+                "generation_mode": "enhanced_single_agent"
+            })
         except Exception as e:
             logger.error(f"Error updating project.json: {str(e)}")
     
     def request_stop(self):
         """Request stop for the enhanced generator wrapper"""
         logger.info("Stop requested for EnhancedGeneratorWrapper")
-        self.stop_requested = True
\ No newline at end of file
+        self.stop_requested = True
+        self._clear_enhanced_requirements()
+    
+    def _clear_enhanced_requirements(self):
+        self._enhanced_requirements = None
+        self._enhanced_requirements_source = None
+    
+    def _wake_stop_event(self):
+        """Set the running generation's stop event from any thread"""
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass  # Loop already closed, generation has finished
\ No newline at end of file
@@ -1,18 +1,54 @@
 # backend/app/services/enhanced_test_agent.py
 import asyncio
+import json
 import logging
+import re
+from collections import Counter, defaultdict
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 from app.services.llm_service import LLMService
 from app.services.test_generator import TestGenerator
 from app.services.test_runner import TestRunner
-from app.services.iteration_manager import IterationManager, IterationStructure
+from app.services.iteration_manager import IterationManager, IterationReport, IterationStructure
 from app.services.code_validator import ValidationReport
 from app.services.compilation_checker import CompilationResult
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Failure category -> severity: high blocks execution, medium is functional, low is non-critical
+SEVERITY_BY_CATEGORY = {
+    "syntax_issue": "high",
+    "import_issue": "high",
+    "build_issue": "high",
+    "dependency_issue": "medium",
+    "logic_issue": "medium",
+    "timeout_issue": "low",
+}
+
+# Quoted names in import error messages, e.g. No module named 'app.models'
+QUOTED_NAME_RE = re.compile(r"'([^']+)'")
+
+# Short test result fields that say whether a run was simulated
+MOCK_RESULT_FIELDS = ("message", "mode", "status", "type")
+
+# Seconds to wait for the LLM to generate an iteration's tests before skipping them
+TEST_GENERATION_TIMEOUT = 300
+
+# Error message keywords -> failure category, checked in order (first match wins)
+FAILURE_CATEGORY_KEYWORDS = (
+    (("import", "module"), "import_issue"),
+    (("syntax",), "syntax_issue"),
+    (("dependency", "package"), "dependency_issue"),
+    (("timeout",), "timeout_issue"),
+    (("assertion", "expect"), "logic_issue"),
+)
+
 class EnhancedTestAgent:
     """
     Enhanced Test Agent that integrates validation, compilation checking, and testing
@@ -39,77 +75,100 @@ class EnhancedTestAgent:
         logger.info(f"Processing complete iteration {iteration} for {project_name}")
         
         try:
-            # Step 1: Validate generated code
-            logger.info("Step 1: Validating code")
-            validation_report = await self.iteration_manager.validate_iteration(
-                iteration_structure, project_name, iteration
-            )
-            
-            # Step 2: Check compilation
-            logger.info("Step 2: Checking compilation")
-            compilation_report = await self.iteration_manager.check_compilation(
-                iteration_structure, project_name
+            # Steps 1-2: Validate generated code and check compilation.
+            # Both only read the iteration files, so they run concurrently
+            logger.info("Steps 1-2: Validating code and checking compilation")
+            validation_report, compilation_report = await asyncio.gather(
+                self.iteration_manager.validate_iteration(
+                    iteration_structure, project_name, iteration
+                ),
+                self.iteration_manager.check_compilation(
+                    iteration_structure, project_name
+                )
             )
             
             # Step 3: Generate tests (only if validation and compilation are acceptable)
-            test_files = {}
+            test_files_generated = 0
             test_results = {"success": False, "message": "Tests not run due to critical errors"}
             
-            critical_errors = (
-                validation_report.summary.get("error", 0) > 0 or
-                not compilation_report.success
-            )
+            validation_errors = validation_report.summary.get("error", 0)
+            critical_errors = validation_errors > 0 or not compilation_report.success
             
             if not critical_errors:
                 logger.info("Step 3: Generating tests")
-                test_files = await self.test_generator.generate_tests(
-                    requirements, code_files, provider
-                )
-                
-                # Save test files to structured location
-                self.iteration_manager.save_test_files(iteration_structure, test_files)
+                # Dependencies install for the test run while the LLM writes the tests
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        generation = tg.create_task(self._generate_tests_with_timeout(requirements, code_files, provider))
+                        tg.create_task(self.test_runner.prepare_test_environment(iteration_structure.iteration_path))
+                except* Exception as group:
+                    # Report the failure itself, not "unhandled errors in a TaskGroup"
+                    raise group.exceptions[0]
+                generated_tests = generation.result()
+                del generation  # the finished task would keep the test sources alive
                 
-                # Step 4: Run tests
-                logger.info("Step 4: Running tests")
-                test_results = await self.test_runner.run_tests(
-                    iteration_structure.iteration_path, test_files
-                )
+                if generated_tests is None:
+                    test_results = {
+                        "success": False,
+                        "message": f"Tests skipped: generation timed out after {TEST_GENERATION_TIMEOUT}s"
+                    }
+                else:
+                    test_files_generated = len(generated_tests)
+                    
+                    # Save test files to structured location
+                    await asyncio.to_thread(self.iteration_manager.save_test_files, iteration_structure, generated_tests)
+                    
+                    # Step 4: Run tests
+                    logger.info("Step 4: Running tests")
+                    test_results = await self.test_runner.run_tests(
+                        iteration_structure.iteration_path, generated_tests
+                    )
+                    # Only the count is reported: release the test sources before the report steps
+                    del generated_tests
             else:
                 logger.warning("Skipping test generation and execution due to critical errors")
                 test_results = {
                     "success": False,
                     "message": "Tests skipped due to validation or compilation errors",
-                    "validation_errors": validation_report.summary.get("error", 0),
+                    "validation_errors": validation_errors,
                     "compilation_success": compilation_report.success
                 }
             
-            # Step 5: Save test results
-            self.iteration_manager.save_test_results(iteration_structure, test_results)
-            
-            # Step 6: Create comprehensive iteration report
+            # Step 5: Create comprehensive iteration report
+            success = self._determine_overall_success(validation_report, compilation_report, test_results)
             iteration_report = self._create_iteration_report(
                 iteration, project_name, validation_report, 
-                compilation_report, test_results, len(code_files)
+                compilation_report, test_results, len(code_files), success
             )
             
-            self.iteration_manager.create_iteration_summary(iteration_structure, iteration_report)
+            # Serialized once for the summary file and the result
+            iteration_report_dict = iteration_report.to_dict()
             
-            # Step 7: Analyze progress
-            progress = self.iteration_manager.analyze_iteration_progress(
-                iteration, iteration_structure.iteration_path.parent,
-                validation_report, compilation_report, test_results
+            # Steps 6-7: Save test results and summary, analyze progress against the
+            # previous iteration's reports; independent file I/O, overlapped in threads
+            _, _, progress = await asyncio.gather(
+                asyncio.to_thread(self.iteration_manager.save_test_results, iteration_structure, test_results),
+                asyncio.to_thread(
+                    self.iteration_manager.create_iteration_summary,
+                    iteration_structure, iteration_report, iteration_report_dict
+                ),
+                asyncio.to_thread(
+                    self.iteration_manager.analyze_iteration_progress,
+                    iteration, iteration_structure.iteration_path.parent,
+                    validation_report, compilation_report, test_results
+                )
             )
             
-            # Prepare result
+            # Prepare result (the report dicts are shared with iteration_report's)
             result = {
                 "iteration": iteration,
-                "success": self._determine_overall_success(validation_report, compilation_report, test_results),
-                "validation_report": validation_report.to_dict(),
-                "compilation_report": compilation_report.to_dict(),
+                "success": success,
+                "validation_report": iteration_report_dict["validation_report"],
+                "compilation_report": iteration_report_dict["compilation_report"],
                 "test_results": test_results,
-                "test_files_generated": len(test_files),
+                "test_files_generated": test_files_generated,
                 "progress": progress,
-                "iteration_report": iteration_report.to_dict(),
+                "iteration_report": iteration_report_dict,
                 "errors_for_fixing": self.iteration_manager.get_error_context_for_next_iteration(
                     validation_report, compilation_report, test_results
                 ),
@@ -133,16 +192,29 @@ class EnhancedTestAgent:
                 "progress": {"iteration": iteration, "improvements": [], "remaining_issues": [str(e)]}
             }
     
+    async def _generate_tests_with_timeout(self,
+                                          requirements: Dict[str, Any],
+                                          code_files: Dict[str, str],
+                                          provider: str) -> Optional[Dict[str, str]]:
+        """Generated test files, or None if the LLM took longer than TEST_GENERATION_TIMEOUT"""
+        try:
+            return await asyncio.wait_for(
+                self.test_generator.generate_tests(requirements, code_files, provider),
+                timeout=TEST_GENERATION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Test generation timed out after {TEST_GENERATION_TIMEOUT}s")
+            return None
+    
     def _create_iteration_report(self,
                                iteration: int,
                                project_name: str,
                                validation_report: ValidationReport,
                                compilation_report: CompilationResult,
                                test_results: Dict[str, Any],
-                               files_generated: int) -> Any:
+                               files_generated: int,
+                               success: Optional[bool] = None) -> IterationReport:
         """Create a comprehensive iteration report"""
-        from app.services.iteration_manager import IterationReport
-        
         # Calculate metrics
         errors_remaining = (
             validation_report.summary.get("error", 0) +
@@ -150,7 +222,8 @@ class EnhancedTestAgent:
             (0 if test_results.get("success", False) else 1)
         )
         
-        success = self._determine_overall_success(validation_report, compilation_report, test_results)
+        if success is None:
+            success = self._determine_overall_success(validation_report, compilation_report, test_results)
         
         return IterationReport(
             iteration=iteration,
@@ -197,10 +270,9 @@ class EnhancedTestAgent:
         
         # Validation recommendations
         if validation_report.summary.get("error", 0) > 0:
-            error_types = {}
-            for issue in validation_report.issues:
-                if issue.severity == "error":
-                    error_types[issue.issue_type] = error_types.get(issue.issue_type, 0) + 1
+            error_types = Counter(
+                issue.issue_type for issue in validation_report.issues if issue.severity == "error"
+            )
             
             for error_type, count in error_types.items():
                 if error_type == "import_error":
@@ -212,9 +284,7 @@ class EnhancedTestAgent:
         
         # Compilation recommendations
         if not compilation_report.success:
-            error_types = {}
-            for error in compilation_report.errors:
-                error_types[error.error_type] = error_types.get(error.error_type, 0) + 1
+            error_types = Counter(error.error_type for error in compilation_report.errors)
             
             for error_type, count in error_types.items():
                 if error_type == "dependency":
@@ -250,29 +320,20 @@ class EnhancedTestAgent:
         """
         logger.info("Analyzing test failures in detail")
         
-        failures = []
-        
         # Use existing test runner analysis as base
         base_failures = self.test_runner.analyze_test_failures(test_results)
         
-        # Enhance with additional context
-        for failure in base_failures:
-            enhanced_failure = {
-                **failure,
-                "category": self._categorize_failure(failure),
-                "severity": self._assess_failure_severity(failure),
-                "suggested_fix": self._suggest_fix_for_failure(failure),
-                "related_files": self._find_related_files(failure, iteration_structure)
-            }
-            failures.append(enhanced_failure)
+        # Enhance with additional context; related-file lookups stat the disk, so the
+        # whole batch runs in one worker thread instead of on the event loop
+        failures = await asyncio.to_thread(self._enhance_failures, base_failures, iteration_structure)
         
         # Add compilation failures as test failures
         compilation_report_path = iteration_structure.compilation_report_path
-        if compilation_report_path.exists():
+        if await asyncio.to_thread(compilation_report_path.exists):
             try:
-                import json
-                with open(compilation_report_path, 'r') as f:
-                    compilation_data = json.load(f)
+                # Read off the event loop; compilation reports can be large
+                raw = await asyncio.to_thread(compilation_report_path.read_bytes)
+                compilation_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                 
                 for error in compilation_data.get("errors", []):
                     failures.append({
@@ -292,50 +353,52 @@ class EnhancedTestAgent:
         logger.info(f"Analyzed {len(failures)} detailed failures")
         return failures
     
+    def _enhance_failures(self,
+                          base_failures: List[Dict[str, Any]],
+                          iteration_structure: IterationStructure) -> List[Dict[str, Any]]:
+        """Add category, severity, suggested fix and related files to each failure"""
+        # Module paths probed on disk, shared by all failures: they often name the same modules
+        path_exists: Dict[str, bool] = {}
+        
+        failures = []
+        for failure in base_failures:
+            # Categorized once; the helpers below all branch on it
+            category = self._categorize_failure(failure)
+            failures.append({
+                **failure,
+                "category": category,
+                "severity": self._assess_failure_severity(failure, category),
+                "suggested_fix": self._suggest_fix_for_failure(failure, category),
+                "related_files": self._find_related_files(failure, iteration_structure, category, path_exists)
+            })
+        return failures
+    
     def _categorize_failure(self, failure: Dict[str, Any]) -> str:
         """Categorize the type of failure"""
         error_msg = failure.get("error", "").lower()
-        failure_type = failure.get("type", "").lower()
-        
-        if "import" in error_msg or "module" in error_msg:
-            return "import_issue"
-        elif "syntax" in error_msg:
-            return "syntax_issue"  
-        elif "dependency" in error_msg or "package" in error_msg:
-            return "dependency_issue"
-        elif "timeout" in error_msg:
-            return "timeout_issue"
-        elif "assertion" in error_msg or "expect" in error_msg:
-            return "logic_issue"
-        elif failure_type == "compilation":
+        
+        for keywords, category in FAILURE_CATEGORY_KEYWORDS:
+            if any(keyword in error_msg for keyword in keywords):
+                return category
+        
+        if failure.get("type", "").lower() == "compilation":
             return "build_issue"
-        else:
-            return "unknown_issue"
+        return "unknown_issue"
     
-    def _assess_failure_severity(self, failure: Dict[str, Any]) -> str:
+    def _assess_failure_severity(self, failure: Dict[str, Any], category: Optional[str] = None) -> str:
         """Assess the severity of a failure"""
-        category = self._categorize_failure(failure)
-        failure_type = failure.get("type", "").lower()
+        if category is None:
+            category = self._categorize_failure(failure)
         
-        # High severity - blocks execution
-        if category in ["syntax_issue", "import_issue", "build_issue"]:
+        # Compilation failures block execution whatever their message says
+        if failure.get("type", "").lower() == "compilation":
             return "high"
-        elif failure_type == "compilation":
-            return "high"
-        
-        # Medium severity - functional issues
-        elif category in ["dependency_issue", "logic_issue"]:
-            return "medium"
-        
-        # Low severity - non-critical issues
-        elif category in ["timeout_issue"]:
-            return "low"
-        
-        return "medium"  # default
+        return SEVERITY_BY_CATEGORY.get(category, "medium")
     
-    def _suggest_fix_for_failure(self, failure: Dict[str, Any]) -> str:
+    def _suggest_fix_for_failure(self, failure: Dict[str, Any], category: Optional[str] = None) -> str:
         """Suggest a specific fix for the failure"""
-        category = self._categorize_failure(failure)
+        if category is None:
+            category = self._categorize_failure(failure)
         error_msg = failure.get("error", "")
         
         suggestions = {
@@ -362,8 +425,10 @@ class EnhancedTestAgent:
     
     def _find_related_files(self, 
                           failure: Dict[str, Any], 
-                          iteration_structure: IterationStructure) -> List[str]:
-        """Find files related to the failure"""
+                          iteration_structure: IterationStructure,
+                          category: Optional[str] = None,
+                          path_exists: Optional[Dict[str, bool]] = None) -> List[str]:
+        """Find files related to the failure; path_exists memoizes probes across calls"""
         related_files = []
         
         # Add the file mentioned in the failure
@@ -371,15 +436,21 @@ class EnhancedTestAgent:
             related_files.append(failure["file"])
         
         # For import issues, try to find imported files
-        if self._categorize_failure(failure) == "import_issue":
+        if category is None:
+            category = self._categorize_failure(failure)
+        if category == "import_issue":
             error_msg = failure.get("error", "")
             # Try to extract module names from error messages
-            import re
-            import_matches = re.findall(r"'([^']+)'", error_msg)
+            import_matches = QUOTED_NAME_RE.findall(error_msg)
+            if path_exists is None:
+                path_exists = {}
             for match in import_matches:
                 # Convert import path to potential file path
                 potential_path = match.replace(".", "/") + ".py"
-                if (iteration_structure.project_path / potential_path).exists():
+                exists = path_exists.get(potential_path)
+                if exists is None:
+                    exists = path_exists[potential_path] = (iteration_structure.project_path / potential_path).exists()
+                if exists:
                     related_files.append(potential_path)
         
         return related_files
@@ -395,20 +466,23 @@ class EnhancedTestAgent:
         """
         logger.info("Generating enhanced tests with validation and compilation context")
         
-        # Enhance requirements with validation and compilation context
-        enhanced_requirements = dict(requirements)
-        enhanced_requirements["_validation_context"] = {
-            "validation_errors": validation_report.summary.get("error", 0),
-            "validation_warnings": validation_report.summary.get("warning", 0),
-            "structure_valid": validation_report.structure_valid,
-            "dependencies_valid": validation_report.dependencies_valid
-        }
-        
-        enhanced_requirements["_compilation_context"] = {
-            "project_type": compilation_report.project_type,
-            "compilation_success": compilation_report.success,
-            "dependencies_installed": compilation_report.dependencies_installed,
-            "compilation_errors": len(compilation_report.errors)
+        # Enhance requirements with validation and compilation context.
+        # Shallow overlay: nested requirement values are shared, not copied.
+        # It must stay a plain dict (not a ChainMap) for anything that json.dumps it.
+        enhanced_requirements = {
+            **requirements,
+            "_validation_context": {
+                "validation_errors": validation_report.summary.get("error", 0),
+                "validation_warnings": validation_report.summary.get("warning", 0),
+                "structure_valid": validation_report.structure_valid,
+                "dependencies_valid": validation_report.dependencies_valid
+            },
+            "_compilation_context": {
+                "project_type": compilation_report.project_type,
+                "compilation_success": compilation_report.success,
+                "dependencies_installed": compilation_report.dependencies_installed,
+                "compilation_errors": len(compilation_report.errors)
+            }
         }
         
         # Generate tests with enhanced context
@@ -436,11 +510,9 @@ class EnhancedTestAgent:
         validation_tests = {}
         
         # Group issues by file
-        issues_by_file = {}
+        issues_by_file = defaultdict(list)
         for issue in validation_report.issues:
             if issue.severity == "error" and issue.file_path:
-                if issue.file_path not in issues_by_file:
-                    issues_by_file[issue.file_path] = []
                 issues_by_file[issue.file_path].append(issue)
         
         # Generate validation test for each problematic file
@@ -455,8 +527,6 @@ class EnhancedTestAgent:
     
     def _create_validation_test_content(self, file_path: str, issues: List[Any]) -> str:
         """Create content for a validation test file"""
-        from pathlib import Path
-        
         file_stem = Path(file_path).stem
         test_content = f'''"""
 Validation tests for {file_path}
@@ -488,8 +558,7 @@ class TestValidation{file_stem.title()}:
 '''
         
         # Add specific tests for each issue type
-        import_issues = [i for i in issues if i.issue_type == "import_error"]
-        if import_issues:
+        if any(issue.issue_type == "import_error" for issue in issues):
             test_content += '''
     def test_imports_valid(self):
         """Test that all imports are valid"""
@@ -692,7 +761,7 @@ class TestPythonCompilation:
                         categories["e2e_tests"]["failed"] += 1
                 else:
                     # Classify as unit or integration based on test type
-                    if "mock" in str(result).lower():
+                    if self._is_mock(result):
                         categories["unit_tests"]["total"] += 1
                         if success:
                             categories["unit_tests"]["passed"] += 1
@@ -707,6 +776,13 @@ class TestPythonCompilation:
         
         return categories
     
+    def _is_mock(self, result: Dict[str, Any]) -> bool:
+        """Whether a test run result was simulated (TestRunner's mock fallback) instead of executed"""
+        details = result.get("details")
+        if isinstance(details, dict) and details.get("mock"):
+            return True
+        return any("mock" in str(result.get(key, "")).lower() for key in MOCK_RESULT_FIELDS)
+    
     def _generate_test_recommendations(self, test_results: Dict[str, Any]) -> List[str]:
         """Generate specific recommendations based on test results"""
         recommendations = []
@@ -715,7 +791,7 @@ class TestPythonCompilation:
             # Frontend test recommendations
             if "frontend" in test_results and not test_results["frontend"].get("success", True):
                 frontend_result = test_results["frontend"]
-                if "mock" in str(frontend_result).get("message", "").lower():
+                if self._is_mock(frontend_result):
                     recommendations.append("Frontend tests are running in mock mode - set up real testing environment")
                 else:
                     recommendations.append("Fix frontend test failures - check component logic and test setup")
@@ -723,7 +799,7 @@ class TestPythonCompilation:
             # Backend test recommendations
             if "backend" in test_results and not test_results["backend"].get("success", True):
                 backend_result = test_results["backend"]
-                if "mock" in str(backend_result).get("message", "").lower():
+                if self._is_mock(backend_result):
                     recommendations.append("Backend tests are running in mock mode - set up real testing environment")
                 else:
                     recommendations.append("Fix backend test failures - check API logic and database connections")
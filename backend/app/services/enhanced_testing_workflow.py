@@ -339,7 +339,7 @@ Dati di copertura:
 {json.dumps(coverage_data, indent=2)}
 
 File di codice totali: {len(code_files)}
-Tipi di file: {list(set([f.split('.')[-1] for f in code_files.keys() if '.' in f]))}
+Tipi di file: {list(dict.fromkeys(f.split('.')[-1] for f in code_files.keys() if '.' in f))}
 
 Test eseguiti: {coverage_data['test_types_executed']}
 Successo: {coverage_data['test_success_rate']}
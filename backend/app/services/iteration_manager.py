@@ -1,6 +1,8 @@
 # backend/app/services/iteration_manager.py
+import asyncio
 import json
 import logging
+import os
 import shutil
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
@@ -8,9 +10,19 @@ from dataclasses import dataclass
 
 from app.services.code_validator import CodeValidator, ValidationReport
 from app.services.compilation_checker import CompilationChecker, CompilationResult
+from app.services.unified_structure_manager import SKIP_LOAD_DIRS
 
 logger = logging.getLogger(__name__)
 
+# "iter-N" directory names, formatted once per iteration number
+_ITER_DIRNAMES: Dict[int, str] = {}
+
+def _iter_dirname(iteration: int) -> str:
+    dirname = _ITER_DIRNAMES.get(iteration)
+    if dirname is None:
+        dirname = _ITER_DIRNAMES[iteration] = f"iter-{iteration}"
+    return dirname
+
 @dataclass
 class IterationStructure:
     """Defines the structure for an iteration directory"""
@@ -72,7 +84,7 @@ class IterationManager:
         logger.info(f"Creating iteration {iteration} structure for project {project_name}")
         
         # Main iteration directory
-        iteration_path = project_path / f"iter-{iteration}"
+        iteration_path = project_path / _iter_dirname(iteration)
         iteration_path.mkdir(parents=True, exist_ok=True)
         
         # Project code directory
@@ -288,17 +300,17 @@ class IterationManager:
         """
         logger.info(f"Validating iteration {iteration}")
         
-        # Run code validation
-        validation_report = self.code_validator.validate_iteration(
+        # Run code validation (static analysis walks every file: keep it off the event loop,
+        # so it overlaps with the compilation check and other projects)
+        validation_report = await asyncio.to_thread(
+            self.code_validator.validate_iteration,
             structure.iteration_path, project_name, iteration
         )
         
         # Save validation report
-        try:
-            with open(structure.validation_report_path, 'w') as f:
-                json.dump(validation_report.to_dict(), f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving validation report: {e}")
+        await asyncio.to_thread(
+            self._write_report, structure.validation_report_path, validation_report.to_dict(), "validation report"
+        )
         
         logger.info(f"Validation completed: {validation_report.summary}")
         return validation_report
@@ -317,15 +329,20 @@ class IterationManager:
         )
         
         # Save compilation report
-        try:
-            with open(structure.compilation_report_path, 'w') as f:
-                json.dump(compilation_report.to_dict(), f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving compilation report: {e}")
+        await asyncio.to_thread(
+            self._write_report, structure.compilation_report_path, compilation_report.to_dict(), "compilation report"
+        )
         
         logger.info(f"Compilation check completed: Success={compilation_report.success}")
         return compilation_report
     
+    def _write_report(self, report_path: Path, data: Dict[str, Any], label: str) -> None:
+        try:
+            with open(report_path, 'w') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving {label}: {e}")
+    
     def save_test_results(self, 
                          structure: IterationStructure, 
                          test_results: Dict[str, Any]) -> None:
@@ -342,17 +359,18 @@ class IterationManager:
     
     def create_iteration_summary(self, 
                                structure: IterationStructure,
-                               iteration_report: IterationReport) -> None:
+                               iteration_report: IterationReport,
+                               report_dict: Optional[Dict[str, Any]] = None) -> None:
         """
         Create a summary of the iteration
+        
+        report_dict: iteration_report.to_dict(), if the caller already has it
         """
         logger.info(f"Creating summary for iteration {iteration_report.iteration}")
         
-        try:
-            with open(structure.iteration_summary_path, 'w') as f:
-                json.dump(iteration_report.to_dict(), f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving iteration summary: {e}")
+        if report_dict is None:
+            report_dict = iteration_report.to_dict()
+        self._write_report(structure.iteration_summary_path, report_dict, "iteration summary")
     
     def analyze_iteration_progress(self, 
                                  current_iteration: int,
@@ -378,7 +396,7 @@ class IterationManager:
         
         # Compare with previous iteration if available
         if current_iteration > 1:
-            prev_iteration_path = project_path / f"iter-{current_iteration - 1}"
+            prev_iteration_path = project_path / _iter_dirname(current_iteration - 1)
             prev_validation_path = prev_iteration_path / "validation_report.json"
             prev_compilation_path = prev_iteration_path / "compilation_report.json"
             
@@ -504,23 +522,26 @@ class IterationManager:
             return None
         
         prev_iteration = iteration - 1
-        prev_path = project_path / f"iter-{prev_iteration}" / project_name
+        prev_path = os.path.join(os.fspath(project_path), _iter_dirname(prev_iteration), project_name)
         
-        if not prev_path.exists():
+        if not os.path.isdir(prev_path):
             logger.warning(f"Previous iteration {prev_iteration} not found")
             return None
         
         logger.info(f"Loading files from iteration {prev_iteration}")
         
         files = {}
+        prefix_length = len(prev_path) + 1
         try:
-            for file_path in prev_path.rglob("*"):
-                if file_path.is_file():
-                    relative_path = str(file_path.relative_to(prev_path))
+            for dirpath, dirnames, filenames in os.walk(prev_path, followlinks=False):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_LOAD_DIRS]
+                for filename in filenames:
+                    file_path = os.path.join(dirpath, filename)
+                    relative_path = file_path[prefix_length:]
                     try:
                         with open(file_path, 'r', encoding='utf-8') as f:
                             files[relative_path] = f.read()
-                    except Exception as e:
+                    except (OSError, UnicodeDecodeError) as e:
                         logger.warning(f"Could not read {relative_path}: {e}")
         
         except Exception as e:
@@ -539,7 +560,7 @@ class IterationManager:
         """
         logger.info(f"Cleaning up iteration {iteration}")
         
-        iteration_path = project_path / f"iter-{iteration}"
+        iteration_path = project_path / _iter_dirname(iteration)
         if not iteration_path.exists():
             return
         
@@ -618,7 +639,7 @@ class IterationManager:
             
             # Analyze each iteration
             for iteration in iterations:
-                iter_path = project_path / f"iter-{iteration}"
+                iter_path = project_path / _iter_dirname(iteration)
                 iter_stats = {
                     "iteration": iteration,
                     "validation_errors": 0,
@@ -694,7 +715,7 @@ class IterationManager:
         """
         logger.info(f"Exporting iteration {iteration} report in {format} format")
         
-        iteration_path = project_path / f"iter-{iteration}"
+        iteration_path = project_path / _iter_dirname(iteration)
         if not iteration_path.exists():
             logger.error(f"Iteration {iteration} not found")
             return None
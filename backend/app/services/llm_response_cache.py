@@ -0,0 +1,270 @@
+# backend/app/services/llm_response_cache.py
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+_ACCESS_INDEX = "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+
+# Seconds to wait for another worker's write lock before the access counts as a miss
+SQLITE_BUSY_TIMEOUT = 10
+
+# Top-level free-form comment fields that do not change what gets generated
+# (nested keys with these names, like a "comments" feature, are kept)
+NON_SEMANTIC_FIELDS = frozenset({"notes", "comments", "comment"})
+
+
+def _normalize(value: Any) -> Any:
+    """NFC-normalize every string so equivalent requirements hash the same"""
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, dict):
+        return {_normalize(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _strip_whitespace(value: Any) -> Any:
+    """Drop surrounding whitespace from every string; everything else is kept as is"""
+    if isinstance(value, dict):
+        return {k: _strip_whitespace(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_strip_whitespace(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _canonicalize(requirements: Dict[str, Any]) -> Dict[str, Any]:
+    """Requirements without their top-level comment fields and surrounding whitespace"""
+    if not isinstance(requirements, dict):
+        return _strip_whitespace(requirements)
+    return {
+        k: _strip_whitespace(v) for k, v in requirements.items() if k not in NON_SEMANTIC_FIELDS
+    }
+
+
+def _consume_exception(future: asyncio.Future):
+    # Nobody may be waiting on a failed flight; don't log "exception never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+class LLMResponseCache:
+    """
+    💾 LLM RESPONSE CACHE - Generated file maps keyed by generation inputs
+
+    Keys cover only what changes the output (operation, provider, requirements,
+    iteration, errors, existing files), never project ids or timestamps, so a retry
+    of the same generation is served from disk instead of calling the LLM again.
+    Backed by SQLite so entries survive worker restarts; entries expire after the
+    TTL and the least recently used ones are evicted past max_entries.
+    With refresh=True cached entries are ignored and overwritten by the new
+    responses, to regenerate a project with unchanged inputs.
+    """
+
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None,
+                 refresh: bool = False):
+        self.db_path = db_path or settings.LLM_RESPONSE_CACHE_PATH
+        self.ttl_seconds = settings.LLM_RESPONSE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = settings.LLM_RESPONSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.enabled = self.max_entries > 0
+        self.refresh = refresh
+
+        # Requirements object last digested and its digest (see _requirements_digest)
+        self._digest_source: Optional[Dict[str, Any]] = None
+        self._digest = ""
+        
+        # key -> future of the generation currently running for it
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Opened lazily, and again after a fork (Celery prefork workers)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def make_key(self,
+                 op: str,
+                 provider: str,
+                 requirements: Dict[str, Any],
+                 iteration: Optional[int] = None,
+                 errors: Optional[List[Dict[str, Any]]] = None,
+                 files: Optional[Dict[str, str]] = None) -> str:
+        """Digest of the inputs that affect a generation's output"""
+        payload = {
+            "op": op,
+            "provider": provider,
+            "requirements": self._requirements_digest(requirements),
+            "iteration": iteration,
+            "errors": _normalize(errors) if errors is not None else None,
+            "files_hash": self._files_digest(files) if files is not None else None
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _requirements_digest(self, requirements: Dict[str, Any]) -> str:
+        """
+        Digest of the canonicalized requirements: key order, Unicode form, surrounding
+        whitespace and top-level comment fields don't change it; any other difference
+        (including the order of list items) does.
+        A run passes the same dict to every call, so it is serialized once per
+        requirements object, not once per key.
+        """
+        if self._digest_source is not requirements:
+            normalized = _canonicalize(_normalize(requirements))
+            if orjson is not None:
+                data = orjson.dumps(
+                    normalized, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+                )
+            else:
+                data = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+            self._digest = hashlib.sha256(data).hexdigest()
+            self._digest_source = requirements
+        return self._digest
+
+    def _files_digest(self, files: Dict[str, str]) -> str:
+        digest = hashlib.sha256()
+        for file_path in sorted(files):
+            digest.update(file_path.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(files[file_path].encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached response for key, or None on a miss"""
+        if not self.enabled or self.refresh:
+            return None
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, model: Optional[str] = None):
+        """Store a response under key"""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self._set, key, value, model)
+
+    async def get_or_call(self,
+                          key: str,
+                          coro_factory: Callable[[], Awaitable[Any]],
+                          model: Optional[str] = None) -> Any:
+        """
+        Cached response for key; on a miss await coro_factory() and cache its result.
+        Empty results (generators fall back to {} on failure) are not cached.
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            logger.info(f"💾 LLM response cache hit ({key[:12]})")
+            return cached
+
+        # Single flight: a concurrent caller with the same key waits for this call
+        # (checked with no await before registering, so two misses cannot both call)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info(f"💾 Joining in-flight LLM generation ({key[:12]})")
+            return copy.deepcopy(await asyncio.shield(inflight))
+        
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        self._inflight[key] = future
+        try:
+            result = await coro_factory()
+            if result:
+                await self.set(key, result, model)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._inflight[key]
+        return result
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")  # readers in other workers don't block writers
+            conn.execute(_SCHEMA)
+            conn.execute(_ACCESS_INDEX)
+            conn.commit()
+            self._conn, self._conn_pid = conn, pid
+        return self._conn
+
+    def _get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return json.loads(value)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            # The cache must never break generation; a failure is just a miss
+            logger.warning(f"LLM response cache read failed: {e}")
+            return None
+
+    def _set(self, key: str, value: Any, model: Optional[str]):
+        now = time.time()
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model, payload, now, now)
+                )
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logger.warning(f"LLM response cache write failed: {e}")
@@ -1,14 +1,36 @@
+import asyncio
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional
 import openai
 import anthropic
 import httpx
 from app.core.config import settings
 
+# Per event loop (Celery runs each task in a fresh one): provider -> request slots
+_provider_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Bounds concurrent requests to a provider, so parallel agents don't trigger rate limits"""
+    semaphores = _provider_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        semaphore = semaphores[provider] = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return semaphore
+
 class LLMProvider(ABC):
     @abstractmethod
     async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         pass
+    
+    async def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield the response in chunks; providers without streaming yield it whole"""
+        yield await self.generate(prompt, system_prompt)
+    
+    async def aclose(self):
+        """Release pooled connections"""
 
 class OpenAIProvider(LLMProvider):
     def __init__(self):
@@ -28,6 +50,30 @@ class OpenAIProvider(LLMProvider):
         )
         
         return response.choices[0].message.content
+    
+    async def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        stream = await self.client.chat.completions.create(
+            model="gpt-4o-2024-05-13",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=4000,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Closing the response stops generation if the caller quit early
+            await stream.response.aclose()
+    
+    async def aclose(self):
+        await self.client.close()
 
 class AnthropicProvider(LLMProvider):
     def __init__(self):
@@ -46,32 +92,76 @@ class AnthropicProvider(LLMProvider):
         )
         
         return response.content[0].text
+    
+    async def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        else:
+            full_prompt = prompt
+        
+        stream = await self.client.messages.create(
+            model="claude-3-opus-20240229",
+            max_tokens=4000,
+            messages=[{"role": "user", "content": full_prompt}],
+            stream=True
+        )
+        try:
+            async for event in stream:
+                if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
+        finally:
+            await stream.response.aclose()
+    
+    async def aclose(self):
+        await self.client.close()
 
 class DeepSeekProvider(LLMProvider):
     def __init__(self):
         self.base_url = settings.DEEPSEEK_URL  # RunPod endpoint
         self.api_key = settings.DEEPSEEK_API_KEY
+        # One pooled client per event loop, so TLS and DNS setup happen once per worker task
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
     
-    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        async with httpx.AsyncClient() as client:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
-            response = await client.post(
-                f"{self.base_url}/v1/chat/completions",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                json={
-                    "model": "deepseek-coder",
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 4000
-                }
+    def _get_client(self) -> httpx.AsyncClient:
+        # Celery tasks run each generation in a fresh event loop
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
             )
-            
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            self._client_loop = loop
+        return self._client
+    
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        response = await self._get_client().post(
+            f"{self.base_url}/v1/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": "deepseek-coder",
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": 4000
+            }
+        )
+        
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+    
+    async def aclose(self):
+        client, self._client, self._client_loop = self._client, None, None
+        if client is None or client.is_closed:
+            return
+        try:
+            await client.aclose()
+        except RuntimeError:
+            # Its connections belonged to an event loop that has already closed
+            pass
 
 class LLMService:
     def __init__(self):
@@ -89,7 +179,41 @@ class LLMService:
             raise ValueError(f"Unknown provider: {provider}")
         
         llm = self.providers[provider]
-        return await llm.generate(prompt, system_prompt)
+        async with _provider_semaphore(provider):
+            return await llm.generate(prompt, system_prompt)
+    
+    def generate_stream(self,
+                        provider: str,
+                        prompt: str,
+                        system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Async iterator over the response as it is produced. Call aclose() on it
+        to stop early; the provider request is closed with it.
+        """
+        if provider not in self.providers:
+            raise ValueError(f"Unknown provider: {provider}")
+        
+        return self._generate_stream_limited(provider, prompt, system_prompt)
+    
+    async def _generate_stream_limited(self,
+                                       provider: str,
+                                       prompt: str,
+                                       system_prompt: Optional[str]) -> AsyncIterator[str]:
+        # The request slot is held until the stream is exhausted or closed
+        async with _provider_semaphore(provider):
+            stream = self.providers[provider].generate_stream(prompt, system_prompt)
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+    
+    async def aclose(self):
+        """Close every provider's HTTP connection pool"""
+        await asyncio.gather(
+            *(llm.aclose() for llm in self.providers.values()),
+            return_exceptions=True
+        )
     
     # AGGIUNGI QUESTO METODO per compatibilità con CodeGenerator
     async def generate_text(self, prompt: str, provider: str = "anthropic") -> str:
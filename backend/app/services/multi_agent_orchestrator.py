@@ -1,6 +1,7 @@
 # backend/app/services/multi_agent_orchestrator.py
 import logging
 import asyncio
+import time
 from typing import Dict, Any, List, Optional, Callable, Set
 from pathlib import Path
 
@@ -8,6 +9,7 @@ from app.services.llm_service import LLMService
 from app.services.code_generator import CodeGenerator
 from app.services.test_agent import TestAgent
 from app.services.unified_orchestration_manager import UnifiedOrchestrationManager
+from app.services.llm_response_cache import LLMResponseCache
 
 # Multi-agent specific imports
 from app.services.agent_system import SystemAgent
@@ -16,6 +18,12 @@ from app.services.endpoints_agent import EndpointsAgent
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between stat() calls on the STOP_REQUESTED file
+STOP_CHECK_INTERVAL = 0.5
+
+# Specialized agents whose generated files are cached by input
+CACHED_AGENT_TASKS = ("system_agent", "endpoints_agent", "integration_agent")
+
 class MultiAgentOrchestrator:
     """
     🔥 MULTI-AGENT ORCHESTRATOR - Using Unified Components
@@ -26,7 +34,7 @@ class MultiAgentOrchestrator:
     Focus: Enterprise projects requiring specialized agents working together
     """
     
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, response_cache: Optional[LLMResponseCache] = None):
         self.llm_service = llm_service
         
         # Core agents
@@ -41,7 +49,13 @@ class MultiAgentOrchestrator:
         # 🎯 UNIFIED COMPONENTS
         self.unified_manager = UnifiedOrchestrationManager()
         
+        # Specialized agent output for identical inputs (e.g. a retried run) is answered from here
+        # when the caller passes a cache; without one nothing is persisted and only
+        # concurrent identical requests are shared
+        self.response_cache = response_cache if response_cache is not None else LLMResponseCache(max_entries=0)
+        
         self.stop_requested = False
+        self._last_stop_check = float("-inf")
         
         # Multi-agent coordination tracking
         self.agent_coordination = {
@@ -67,7 +81,8 @@ class MultiAgentOrchestrator:
         
         # Check for stop request
         stop_file = project_path / "STOP_REQUESTED"
-        if stop_file.exists():
+        self._last_stop_check = float("-inf")
+        if self._stop_requested(stop_file):
             logger.info(f"Stop file found for project {project_path.name}, stopping generation")
             return {"status": "stopped", "reason": "user_requested"}
         
@@ -79,7 +94,9 @@ class MultiAgentOrchestrator:
             project_name = f"project_{project_path.name}"
         
         # 🎯 CREATE UNIFIED STRUCTURE
-        structure = self.unified_manager.create_project_structure(project_path, project_name)
+        structure = await asyncio.to_thread(
+            self.unified_manager.create_project_structure, project_path, project_name
+        )
         logger.info(f"🏗️ Unified structure created for: {structure['project_name']}")
         
         # Track multi-agent project state
@@ -95,6 +112,10 @@ class MultiAgentOrchestrator:
         }
         
         # 🎯 MULTI-AGENT ANALYSIS AND PLANNING
+        if self._stop_requested(stop_file):
+            logger.info("Stop requested, skipping multi-agent planning")
+            return self._stopped_result(0, project_path, project_state, structure)
+        
         if progress_callback:
             progress_callback(0, 'multi_agent_planning')
         
@@ -107,36 +128,33 @@ class MultiAgentOrchestrator:
             logger.info(f"🔄 Starting multi-agent iteration {iteration} for {structure['project_name']}")
             
             # Check for stop request
-            if stop_file.exists() or self.stop_requested:
+            if self._stop_requested(stop_file):
                 logger.info("Stop requested, interrupting multi-agent generation")
-                return {
-                    "status": "stopped",
-                    "reason": "user_requested",
-                    "iteration": iteration - 1,
-                    "project_id": project_path.name,
-                    "project_state": project_state,
-                    "output_path": str(structure["project_path"])
-                }
+                return self._stopped_result(iteration - 1, project_path, project_state, structure)
             
             try:
                 # Update current iteration in project.json
-                self._update_current_iteration(project_path, iteration)
-                
-                # Progress callback
-                if progress_callback:
-                    progress_callback(iteration, f'multi_agent_collaboration_iteration_{iteration}')
+                await asyncio.to_thread(self._update_current_iteration, project_path, iteration)
                 
                 # 🤖 COLLABORATIVE CODE GENERATION (multi-agent specialty)
+                # One update per phase: each is a round trip to the result backend
                 if progress_callback:
                     progress_callback(iteration, 'multi_agent_collaborative_generation')
                 
                 code_files = await self._generate_code_with_multi_agent_collaboration(
-                    requirements, provider, iteration, structure, multi_agent_plan
+                    requirements, provider, iteration, structure, multi_agent_plan, stop_file
                 )
                 
+                # A stop during the agent phases leaves a partial file set: don't save it.
+                # Unthrottled, so a stop the phase loop just saw is not missed here
+                self._last_stop_check = float("-inf")
+                if self._stop_requested(stop_file):
+                    logger.info("Stop requested during multi-agent generation, discarding partial output")
+                    return self._stopped_result(iteration - 1, project_path, project_state, structure)
+                
                 # 📁 ORGANIZE AND SAVE (unified system)
-                files_generated, files_modified = self.unified_manager.organize_and_save_files(
-                    structure, code_files, requirements
+                files_generated, files_modified = await asyncio.to_thread(
+                    self.unified_manager.organize_and_save_files, structure, code_files, requirements
                 )
                 
                 logger.info(f"✅ Multi-agent iteration {iteration}: Generated {files_generated} files, modified {files_modified}")
@@ -437,7 +455,8 @@ class MultiAgentOrchestrator:
                                                           provider: str,
                                                           iteration: int,
                                                           structure: Dict[str, Path],
-                                                          multi_agent_plan: Dict[str, Any]) -> Dict[str, str]:
+                                                          multi_agent_plan: Dict[str, Any],
+                                                          stop_file: Path) -> Dict[str, str]:
         """
         🤖 GENERATE CODE WITH MULTI-AGENT COLLABORATION
         
@@ -448,12 +467,15 @@ class MultiAgentOrchestrator:
         if iteration == 1:
             # First iteration: full multi-agent collaboration
             return await self._execute_multi_agent_workflow(
-                requirements, provider, multi_agent_plan, structure
+                requirements, provider, multi_agent_plan, structure, stop_file
             )
         else:
             # Subsequent iterations: collaborative error fixing and improvements
-            existing_files = self.unified_manager.load_previous_files(structure)
-            previous_errors = self.unified_manager.load_previous_errors(structure, iteration - 1)
+            # Off the event loop, so other generations keep running during the reads
+            existing_files, previous_errors = await asyncio.gather(
+                asyncio.to_thread(self.unified_manager.load_previous_files, structure),
+                asyncio.to_thread(self.unified_manager.load_previous_errors, structure, iteration - 1)
+            )
             
             if previous_errors and existing_files:
                 logger.info(f"🤖 Multi-agent collaborative error fixing: {len(previous_errors)} errors")
@@ -470,51 +492,41 @@ class MultiAgentOrchestrator:
                                           requirements: Dict[str, Any],
                                           provider: str,
                                           multi_agent_plan: Dict[str, Any],
-                                          structure: Dict[str, Path]) -> Dict[str, str]:
+                                          structure: Dict[str, Path],
+                                          stop_file: Path) -> Dict[str, str]:
         """Execute the multi-agent workflow for initial generation"""
         
         workflow = multi_agent_plan["collaboration_workflow"]
         agent_assignments = multi_agent_plan["agent_assignments"]
         all_generated_files = {}
         
-        # Execute workflow phases
-        for phase in workflow:
-            logger.info(f"🎯 Executing multi-agent phase: {phase['phase']}")
+        # Phases whose dependencies are done run together (e.g. integration alongside
+        # api_development); agents see the files of the phases completed before them
+        phase_names = {phase["phase"] for phase in workflow}
+        completed_phases: Set[str] = set()
+        pending = list(workflow)
+        while pending:
+            # Don't start agents (and their LLM calls) for phases after a stop request
+            if self._stop_requested(stop_file):
+                logger.info(f"Stop requested, skipping {len(pending)} remaining multi-agent phases")
+                return all_generated_files
             
-            phase_files = {}
+            ready = [
+                phase for phase in pending
+                if all(dep in completed_phases or dep not in phase_names for dep in phase.get("dependencies", []))
+            ] or pending[:1]
             
-            # Execute agents in this phase
-            for agent_name in phase["agents"]:
-                if agent_name in agent_assignments:
-                    try:
-                        agent_files = await self._execute_agent_task(
-                            agent_name, requirements, provider, all_generated_files
-                        )
-                        phase_files.update(agent_files)
-                        
-                        # Track collaboration
-                        self.agent_coordination["collaboration_history"].append({
-                            "phase": phase["phase"],
-                            "agent": agent_name,
-                            "files_generated": len(agent_files),
-                            "success": True
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"❌ Agent {agent_name} failed in phase {phase['phase']}: {e}")
-                        
-                        # Track failure
-                        self.agent_coordination["collaboration_history"].append({
-                            "phase": phase["phase"],
-                            "agent": agent_name,
-                            "files_generated": 0,
-                            "success": False,
-                            "error": str(e)
-                        })
+            phase_results = await asyncio.gather(*(
+                self._execute_workflow_phase(phase, agent_assignments, requirements, provider, all_generated_files)
+                for phase in ready
+            ))
             
-            # Merge phase files
-            all_generated_files.update(phase_files)
-            logger.info(f"✅ Phase {phase['phase']} completed: {len(phase_files)} files generated")
+            # Merge phase files in workflow order
+            for phase, phase_files in zip(ready, phase_results):
+                all_generated_files.update(phase_files)
+                completed_phases.add(phase["phase"])
+                pending.remove(phase)
+                logger.info(f"✅ Phase {phase['phase']} completed: {len(phase_files)} files generated")
         
         # Apply multi-agent coordination and conflict resolution
         resolved_files = await self._resolve_multi_agent_conflicts(all_generated_files, requirements)
@@ -522,6 +534,51 @@ class MultiAgentOrchestrator:
         logger.info(f"🤖 Multi-agent workflow completed: {len(resolved_files)} total files")
         return resolved_files
 
+    async def _execute_workflow_phase(self,
+                                      phase: Dict[str, Any],
+                                      agent_assignments: Dict[str, Any],
+                                      requirements: Dict[str, Any],
+                                      provider: str,
+                                      existing_files: Dict[str, str]) -> Dict[str, str]:
+        """Run the assigned agents of one workflow phase concurrently"""
+        logger.info(f"🎯 Executing multi-agent phase: {phase['phase']}")
+        
+        agent_names = [agent_name for agent_name in phase["agents"] if agent_name in agent_assignments]
+        results = await asyncio.gather(
+            *(self._execute_agent_task(agent_name, requirements, provider, existing_files)
+              for agent_name in agent_names),
+            return_exceptions=True
+        )
+        
+        phase_files = {}
+        for agent_name, agent_files in zip(agent_names, results):
+            if isinstance(agent_files, Exception):
+                logger.error(f"❌ Agent {agent_name} failed in phase {phase['phase']}: {agent_files}")
+                
+                # Track failure
+                self.agent_coordination["collaboration_history"].append({
+                    "phase": phase["phase"],
+                    "agent": agent_name,
+                    "files_generated": 0,
+                    "success": False,
+                    "error": str(agent_files)
+                })
+                continue
+            if isinstance(agent_files, BaseException):
+                raise agent_files
+            
+            phase_files.update(agent_files)
+            
+            # Track collaboration
+            self.agent_coordination["collaboration_history"].append({
+                "phase": phase["phase"],
+                "agent": agent_name,
+                "files_generated": len(agent_files),
+                "success": True
+            })
+        
+        return phase_files
+
     async def _execute_agent_task(self,
                                 agent_name: str,
                                 requirements: Dict[str, Any],
@@ -541,36 +598,51 @@ class MultiAgentOrchestrator:
         }
         
         try:
-            if agent_name == "system_agent":
-                return await self.system_agent.generate_system_files(enhanced_requirements, provider)
-            
-            elif agent_name == "code_generator":
-                return await self.code_generator.generate_code(enhanced_requirements, provider, 1)
-            
-            elif agent_name == "endpoints_agent":
-                return await self.endpoints_agent.generate_endpoints(enhanced_requirements, provider)
-            
-            elif agent_name == "integration_agent":
-                return await self.integration_agent.generate_integrations(enhanced_requirements, provider)
-            
-            elif agent_name == "test_agent":
-                # Test agent needs existing files to generate tests
-                if existing_files:
-                    return await self.test_agent.test_generator.generate_tests(
-                        enhanced_requirements, existing_files, provider
-                    )
-                else:
-                    logger.warning("Test agent called without existing files, skipping")
-                    return {}
-            
-            else:
-                logger.warning(f"Unknown agent: {agent_name}")
-                return {}
+            if agent_name in CACHED_AGENT_TASKS:
+                cache_key = self.response_cache.make_key(f"agent:{agent_name}", provider, enhanced_requirements)
+                return await self.response_cache.get_or_call(
+                    cache_key,
+                    lambda: self._run_agent_task(agent_name, enhanced_requirements, provider, existing_files),
+                    model=provider
+                )
+            return await self._run_agent_task(agent_name, enhanced_requirements, provider, existing_files)
                 
         except Exception as e:
             logger.error(f"❌ Error executing {agent_name}: {e}")
             return {}
 
+    async def _run_agent_task(self,
+                              agent_name: str,
+                              enhanced_requirements: Dict[str, Any],
+                              provider: str,
+                              existing_files: Dict[str, str]) -> Dict[str, str]:
+        """Dispatch a task to the named agent"""
+        if agent_name == "system_agent":
+            return await self.system_agent.generate_system_files(enhanced_requirements, provider)
+        
+        elif agent_name == "code_generator":
+            return await self.code_generator.generate_code(enhanced_requirements, provider, 1)
+        
+        elif agent_name == "endpoints_agent":
+            return await self.endpoints_agent.generate_endpoints(enhanced_requirements, provider)
+        
+        elif agent_name == "integration_agent":
+            return await self.integration_agent.generate_integrations(enhanced_requirements, provider)
+        
+        elif agent_name == "test_agent":
+            # Test agent needs existing files to generate tests
+            if existing_files:
+                return await self.test_agent.test_generator.generate_tests(
+                    enhanced_requirements, existing_files, provider
+                )
+            else:
+                logger.warning("Test agent called without existing files, skipping")
+                return {}
+        
+        else:
+            logger.warning(f"Unknown agent: {agent_name}")
+            return {}
+
     async def _execute_collaborative_error_fixing(self,
                                                 requirements: Dict[str, Any],
                                                 provider: str,
@@ -585,7 +657,7 @@ class MultiAgentOrchestrator:
         # Categorize errors by agent specialty
         error_assignments = self._assign_errors_to_agents(errors, multi_agent_plan["agent_assignments"])
         
-        fixed_files = dict(existing_files)
+        fixed_files = existing_files.copy()
         
         # Each agent handles their assigned errors
         for agent_name, agent_errors in error_assignments.items():
@@ -668,11 +740,15 @@ class MultiAgentOrchestrator:
             return await agent.fix_issues(errors, existing_files, provider)
         
         # Fallback to general fixing approach
-        enhanced_requirements = dict(requirements)
-        enhanced_requirements["_error_context"] = {
-            "errors": errors,
-            "agent_specialization": agent_name,
-            "error_count": len(errors)
+        # Shallow overlay: nested requirement values are shared, not copied.
+        # Agents json.dumps requirements, so this must stay a plain dict.
+        enhanced_requirements = {
+            **requirements,
+            "_error_context": {
+                "errors": errors,
+                "agent_specialization": agent_name,
+                "error_count": len(errors)
+            }
         }
         
         if agent_name == "code_generator":
@@ -698,7 +774,7 @@ class MultiAgentOrchestrator:
             requirements, multi_agent_plan, iteration
         )
         
-        improved_files = dict(existing_files)
+        improved_files = existing_files.copy()
         
         # Each agent applies their specialized improvements
         for agent_name, improvement_focus in improvement_assignments.items():
@@ -858,22 +934,40 @@ class MultiAgentOrchestrator:
     def _update_current_iteration(self, project_path: Path, iteration: int):
         """Update current iteration in project.json"""
         try:
-            project_json_path = project_path / "project.json"
-            if project_json_path.exists():
-                import json
-                with open(project_json_path, 'r') as f:
-                    project_data = json.load(f)
-                
-                project_data["current_iteration"] = iteration
-                project_data["structure_type"] = "unified"
-                project_data["generation_mode"] = "multi_agent_collaborative"
-                project_data["active_agents"] = self.agent_coordination["active_agents"]
-                
-                with open(project_json_path, 'w') as f:
-                    json.dump(project_data, f, indent=2)
+            self.unified_manager.update_project_json(project_path, {
+                "current_iteration": iteration,
+                "structure_type": "unified",
+                "generation_mode": "multi_agent_collaborative",
+                "active_agents": self.agent_coordination["active_agents"]
+            })
         except Exception as e:
             logger.error(f"Error updating project.json: {str(e)}")
     
+    def _stopped_result(self,
+                        iteration: int,
+                        project_path: Path,
+                        project_state: Dict[str, Any],
+                        structure: Dict[str, Path]) -> Dict[str, Any]:
+        """Result for a generation interrupted by the user after `iteration` completed iterations"""
+        return {
+            "status": "stopped",
+            "reason": "user_requested",
+            "iteration": iteration,
+            "project_id": project_path.name,
+            "project_state": project_state,
+            "output_path": str(structure["project_path"])
+        }
+    
+    def _stop_requested(self, stop_file: Path) -> bool:
+        """Stop flag or STOP_REQUESTED file; the file is stat'ed at most every STOP_CHECK_INTERVAL"""
+        if self.stop_requested:
+            return True
+        now = time.monotonic()
+        if now - self._last_stop_check < STOP_CHECK_INTERVAL:
+            return False
+        self._last_stop_check = now
+        return stop_file.exists()
+    
     def request_stop(self):
         """Request stop for the multi-agent orchestrator"""
         logger.info("Stop requested for MultiAgentOrchestrator")
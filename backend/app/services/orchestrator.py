@@ -275,7 +275,6 @@ class OrchestratorAgent:
             )
             
             # Save test results
-            import json
             with open(iteration_structure.iteration_path / "test_results.json", 'w') as f:
                 json.dump(test_results, f, indent=2)
             
@@ -2,7 +2,7 @@
 import json
 import shutil
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
@@ -53,6 +53,8 @@ class ProjectStructureManager:
     
     def __init__(self, base_output_path: str = "output"):
         self.base_output_path = Path(base_output_path)
+        # Source files per source_path as of the last read; save_source_code drops the entry
+        self._source_files_cache: Dict[Path, Dict[str, str]] = {}
         logger.info("ProjectStructureManager initialized with clean structure approach")
     
     def create_project_structure(self, project_id: str, project_name: str) -> ProjectStructure:
@@ -110,6 +112,7 @@ class ProjectStructureManager:
             Tuple[files_created, files_modified]
         """
         logger.info(f"Saving source code for iteration {iteration}")
+        self._source_files_cache.pop(structure.source_path, None)
         
         # 📸 Optional: Create snapshot before modifying
         if iteration > 1:
@@ -117,6 +120,8 @@ class ProjectStructureManager:
         
         files_created = 0
         files_modified = 0
+        # Directory già create in questo salvataggio: un solo mkdir per directory
+        created_dirs: Set[Path] = set()
         
         # Save code files to clean source directory
         for file_path, content in code_files.items():
@@ -125,7 +130,9 @@ class ProjectStructureManager:
                 continue
                 
             full_path = structure.source_path / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
+            if full_path.parent not in created_dirs:
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(full_path.parent)
             
             # Check if file exists
             if full_path.exists():
@@ -221,7 +228,14 @@ class ProjectStructureManager:
     def get_current_source_files(self, structure: ProjectStructure) -> Dict[str, str]:
         """
         📖 Legge tutti i file sorgente attuali dalla directory pulita
+        
+        Riletti dal disco solo dopo un save_source_code; altrimenti copia della lettura precedente
         """
+        cached = self._source_files_cache.get(structure.source_path)
+        if cached is not None:
+            logger.info(f"Loaded {len(cached)} source files (unchanged since last read)")
+            return dict(cached)
+        
         logger.info("Loading current source files")
         
         files = {}
@@ -239,7 +253,8 @@ class ProjectStructureManager:
             logger.error(f"Error loading source files: {e}")
         
         logger.info(f"Loaded {len(files)} source files")
-        return files
+        self._source_files_cache[structure.source_path] = files
+        return dict(files)
     
     def create_final_report(self, 
                            structure: ProjectStructure,
@@ -3,7 +3,7 @@ import json
 import subprocess
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import docker
 import tempfile
 import os
@@ -72,7 +72,42 @@ class TestRunner:
             full_path.parent.mkdir(parents=True, exist_ok=True)
             full_path.write_text(content)
     
-    def _setup_test_environment(self, project_path: Path) -> bool:
+    async def _run_command(self,
+                           args: List[str],
+                           cwd: Optional[Path] = None,
+                           check: bool = False,
+                           capture_output: bool = True) -> subprocess.CompletedProcess:
+        """Run a command without blocking the event loop, draining stdout and stderr together"""
+        pipe = asyncio.subprocess.PIPE if capture_output else None
+        process = await asyncio.create_subprocess_exec(*args, cwd=cwd, stdout=pipe, stderr=pipe)
+        try:
+            stdout, stderr = await process.communicate()
+        except BaseException:
+            # Cancelled (e.g. a failed sibling task): don't leave npm/pip running
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+                await asyncio.shield(process.wait())
+            raise
+        
+        result = subprocess.CompletedProcess(
+            args,
+            process.returncode,
+            stdout.decode('utf-8', errors='replace') if stdout is not None else None,
+            stderr.decode('utf-8', errors='replace') if stderr is not None else None
+        )
+        if check:
+            result.check_returncode()
+        return result
+    
+    async def prepare_test_environment(self, project_path: Path) -> None:
+        """Install local test dependencies ahead of run_tests; Docker runs build their own"""
+        if not self.use_docker:
+            await self._setup_test_environment(project_path)
+    
+    async def _setup_test_environment(self, project_path: Path) -> bool:
         """Setup test environment for both frontend and backend tests"""
         try:
             # Setup per test frontend
@@ -82,7 +117,7 @@ class TestRunner:
                 if not (frontend_dir / "node_modules").exists():
                     logger.info(f"Installing Node.js dependencies for {frontend_dir}")
                     try:
-                        subprocess.run(["npm", "install"], cwd=frontend_dir, check=True)
+                        await self._run_command(["npm", "install"], cwd=frontend_dir, check=True, capture_output=False)
                         logger.info("Node.js dependencies installed successfully")
                     except Exception as e:
                         logger.warning(f"Failed to install Node.js dependencies: {e}")
@@ -96,7 +131,7 @@ class TestRunner:
                 if not venv_dir.exists():
                     logger.info(f"Creating virtual environment for {backend_dir}")
                     try:
-                        subprocess.run(["python", "-m", "venv", str(venv_dir)], check=True)
+                        await self._run_command(["python", "-m", "venv", str(venv_dir)], check=True, capture_output=False)
                         
                         # Determina l'eseguibile python nell'ambiente virtuale
                         venv_python = venv_dir / "bin" / "python"
@@ -104,8 +139,8 @@ class TestRunner:
                             venv_python = venv_dir / "Scripts" / "python.exe"  # Per Windows
                         
                         # Installa le dipendenze
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "-r", str(requirements_path)], check=True)
-                        subprocess.run([str(venv_python), "-m", "pip", "install", "pytest"], check=True)
+                        await self._run_command([str(venv_python), "-m", "pip", "install", "-r", str(requirements_path)], check=True, capture_output=False)
+                        await self._run_command([str(venv_python), "-m", "pip", "install", "pytest"], check=True, capture_output=False)
                         logger.info("Python dependencies installed successfully")
                     except Exception as e:
                         logger.warning(f"Failed to setup Python virtual environment: {e}")
@@ -171,7 +206,7 @@ class TestRunner:
     async def _run_frontend_tests_local(self, project_path: Path) -> Dict[str, Any]:
         """Run Jest tests locally without Docker"""
 
-        self._setup_test_environment(project_path)
+        await self._setup_test_environment(project_path)
         
         try:
             # Trova gli eventuali file di test frontend
@@ -192,14 +227,12 @@ class TestRunner:
                 
                 # Esegui npm install se node_modules non esiste
                 if not (frontend_dir / "node_modules").exists():
-                    subprocess.run(["npm", "install"], cwd=frontend_dir, check=True)
+                    await self._run_command(["npm", "install"], cwd=frontend_dir, check=True, capture_output=False)
                 
                 # Esegui i test
-                result = subprocess.run(
+                result = await self._run_command(
                     ["npm", "test", "--", "--watchAll=false"],
-                    cwd=frontend_dir,
-                    capture_output=True,
-                    text=True
+                    cwd=frontend_dir
                 )
                 
                 # Controlla i risultati
@@ -253,7 +286,7 @@ class TestRunner:
                 # Crea un ambiente virtuale per i test
                 venv_dir = project_path / ".venv"
                 if not venv_dir.exists():
-                    subprocess.run(["python", "-m", "venv", str(venv_dir)], check=True)
+                    await self._run_command(["python", "-m", "venv", str(venv_dir)], check=True, capture_output=False)
                 
                 # Determina l'eseguibile python nell'ambiente virtuale
                 venv_python = venv_dir / "bin" / "python"
@@ -261,15 +294,13 @@ class TestRunner:
                     venv_python = venv_dir / "Scripts" / "python.exe"  # Per Windows
                 
                 # Installa le dipendenze
-                subprocess.run([str(venv_python), "-m", "pip", "install", "-r", str(requirements_path)], check=True)
-                subprocess.run([str(venv_python), "-m", "pip", "install", "pytest"], check=True)
+                await self._run_command([str(venv_python), "-m", "pip", "install", "-r", str(requirements_path)], check=True, capture_output=False)
+                await self._run_command([str(venv_python), "-m", "pip", "install", "pytest"], check=True, capture_output=False)
                 
                 # Esegui i test
-                result = subprocess.run(
+                result = await self._run_command(
                     [str(venv_python), "-m", "pytest", "-v"],
-                    cwd=backend_dir,
-                    capture_output=True,
-                    text=True
+                    cwd=backend_dir
                 )
                 
                 # Controlla i risultati
@@ -1,15 +1,50 @@
 # backend/app/services/unified_orchestration_manager.py
+import json
 import logging
+import mmap
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Mapping, Optional, Callable, Tuple
 from datetime import datetime
 
 from app.services.unified_structure_manager import UnifiedStructureManager
 from app.services.unified_file_organizer import UnifiedFileOrganizer
 from app.services.unified_test_validator import UnifiedTestValidator
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# project.json files at least this big are parsed straight from a read-only mapping
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def _loads_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _read_json_file(path: Path, size: int) -> Any:
+    with open(path, 'rb') as f:
+        if orjson is None or size < MMAP_MIN_SIZE:
+            return _loads_json(f.read())
+        # orjson parses buffer-protocol input, so skip the copy into a bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
 class UnifiedOrchestrationManager:
     """
     🎯 UNIFIED ORCHESTRATION MANAGER
@@ -31,6 +66,8 @@ class UnifiedOrchestrationManager:
         self.structure_manager = UnifiedStructureManager()
         self.file_organizer = UnifiedFileOrganizer()
         self.test_validator = UnifiedTestValidator()
+        # project.json contents keyed by path, validated by (mtime_ns, size) of the file
+        self._project_json_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
         logger.info("UnifiedOrchestrationManager initialized with all components")
     
     def create_project_structure(self, project_path: Path, project_name: str) -> Dict[str, Path]:
@@ -101,11 +138,12 @@ class UnifiedOrchestrationManager:
         logger.info(f"✅ Unified validation complete: {'SUCCESS' if validation_result['success'] else 'ISSUES FOUND'}")
         return validation_result
     
-    def load_previous_files(self, structure: Dict[str, Path]) -> Optional[Dict[str, str]]:
+    def load_previous_files(self, structure: Dict[str, Path]) -> Optional[Mapping[str, str]]:
         """
         📖 LOAD PREVIOUS FILES - From unified structure
+        Read-only view of the loaded tree, shared with the structure manager's load cache
         """
-        return self.structure_manager.load_from_unified_structure(structure)
+        return self.structure_manager.load_from_unified_structure(structure, read_only=True)
     
     def load_previous_errors(self, structure: Dict[str, Path], previous_iteration: int) -> list[Dict[str, Any]]:
         """
@@ -160,6 +198,45 @@ class UnifiedOrchestrationManager:
         logger.info(f"📊 Project status: {status['overall_health']}")
         return status
     
+    def update_project_json(self, project_path: Path, updates: Dict[str, Any]) -> bool:
+        """
+        📝 UPDATE PROJECT.JSON - Merge fields and replace the file atomically
+        Returns False if the project has no project.json
+        """
+        project_json_path = project_path / "project.json"
+        try:
+            file_stat = project_json_path.stat()
+        except FileNotFoundError:
+            self._project_json_cache.pop(project_json_path, None)
+            return False
+        
+        # Re-parse only if someone else changed the file since our last write
+        cached = self._project_json_cache.get(project_json_path)
+        if cached is not None and cached[0] == (file_stat.st_mtime_ns, file_stat.st_size):
+            if all(cached[1].get(key, object()) == value for key, value in updates.items()):
+                return True  # Nothing changed, skip the write
+            project_data = dict(cached[1])
+        else:
+            project_data = _read_json_file(project_json_path, file_stat.st_size)
+        project_data.update(updates)
+        
+        # Write to a sibling temp file and rename over the original, so readers
+        # never see a truncated project.json
+        fd, tmp_path = tempfile.mkstemp(dir=project_path, prefix=".project.json.", suffix=".tmp")
+        try:
+            # fdopen owns the descriptor from here on, so it is closed on any failure
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(f.fileno(), file_stat.st_mode & 0o777)
+                f.write(_dumps_json(project_data))
+            os.replace(tmp_path, project_json_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        new_stat = project_json_path.stat()
+        self._project_json_cache[project_json_path] = ((new_stat.st_mtime_ns, new_stat.st_size), project_data)
+        return True
+    
     def cleanup_project(self, structure: Dict[str, Path], keep_reports: bool = True) -> Dict[str, Any]:
         """
         🗑️ CLEANUP PROJECT - Clean unified structure
@@ -1,12 +1,72 @@
 # backend/app/services/unified_structure_manager.py
 import logging
+import os
 import shutil
+import stat
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Tuple
 import re
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads used to read project files in parallel
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Shared read pool: threads are started on first use and reused by every load
+_read_executor = ThreadPoolExecutor(max_workers=MAX_READ_WORKERS, thread_name_prefix="unified-read")
+
+# Directories and files that are never project sources worth loading
+SKIP_LOAD_DIRS = frozenset({
+    'node_modules', '.git', '__pycache__', '.venv', 'venv', '.next', 'dist', 'build', '.pytest_cache'
+})
+BINARY_FILE_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.ico', '.webp', '.bmp', '.pdf',
+    '.zip', '.gz', '.tar', '.woff', '.woff2', '.ttf', '.eot', '.otf',
+    '.mp3', '.mp4', '.pyc', '.so', '.dll', '.exe', '.db', '.sqlite'
+})
+MAX_LOAD_FILE_SIZE = 512 * 1024
+
+# Number of project trees whose loaded files are kept between iterations
+LOAD_CACHE_MAX_ENTRIES = 4
+
+def _read_text_file(file_path: str):
+    """Read a UTF-8 file, returning (content, None) or (None, error)"""
+    try:
+        # Unbuffered: the whole file is read in one call, no BufferedReader needed
+        with open(file_path, 'rb', buffering=0) as f:
+            data = f.read()
+    except OSError as e:
+        return None, e
+    try:
+        return data.decode('utf-8'), None
+    except UnicodeDecodeError as e:
+        return None, e
+
+def _scandir_files(root: str):
+    """
+    Yield (path, (size, mtime_ns)) of loadable source files under root, using scandir's
+    cached entry types. Dependency/build directories, binary assets and files over
+    MAX_LOAD_FILE_SIZE are skipped.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_LOAD_DIRS:
+                    yield from _scandir_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                if os.path.splitext(entry.name)[1].lower() in BINARY_FILE_EXTENSIONS:
+                    continue
+                file_stat = entry.stat(follow_symlinks=False)
+                if file_stat.st_size > MAX_LOAD_FILE_SIZE:
+                    logger.debug(f"Skipping oversize file: {entry.path}")
+                    continue
+                yield entry.path, (file_stat.st_size, file_stat.st_mtime_ns)
+
 class UnifiedStructureManager:
     """
     🔥 UNIFIED STRUCTURE MANAGER
@@ -17,6 +77,9 @@ class UnifiedStructureManager:
     """
     
     def __init__(self):
+        # Project root -> ((size, mtime_ns) of every scanned file, loaded files).
+        # Checked per file on each load, so edits made by anything else are picked up.
+        self._load_cache: Dict[str, Tuple[Dict[str, Tuple[int, int]], Dict[str, str]]] = {}
         logger.info("UnifiedStructureManager initialized")
     
     def create_unified_structure(self, project_path: Path, project_name: str) -> Dict[str, Path]:
@@ -63,76 +126,147 @@ class UnifiedStructureManager:
         
         logger.info(f"💾 Saving to unified structure: {len(organized_files)} files")
         
-        for file_path, content in organized_files.items():
-            # Determine target location
-            if file_path.startswith("env_test/"):
-                # Save to env_test/
-                relative_path = file_path[9:]  # Remove "env_test/"
-                full_path = structure["env_test_path"] / relative_path
-                
-            elif file_path.startswith(project_prefix):
-                # Save to project-{name}/
-                relative_path = file_path[len(project_prefix)+1:]  # Remove "project-{name}/"
-                full_path = structure["project_path"] / relative_path
-                
-            elif file_path in ["requirements.txt", ".env.template", ".gitignore"]:
-                # Root support files
-                full_path = structure["base_path"] / file_path
-                
-            else:
-                # Default to project path
-                full_path = structure["project_path"] / file_path
-            
-            # Create parent directories
-            full_path.parent.mkdir(parents=True, exist_ok=True)
+        # Resolve target locations first so each directory is created only once
+        targets = [
+            (file_path, self._resolve_target_path(structure, file_path, project_prefix), content)
+            for file_path, content in organized_files.items()
+        ]
+        
+        # Create parent directories
+        for parent_dir in {os.path.dirname(full_path) for _, full_path, _ in targets}:
+            os.makedirs(parent_dir, exist_ok=True)
+        
+        files_unchanged = 0
+        for file_path, full_path, content in targets:
+            data = content.encode('utf-8')
             
-            # Check if file exists (for counting)
-            if full_path.exists():
-                files_modified += 1
-            else:
+            # Check if file exists (for counting) and skip rewriting identical content
+            try:
+                existing_size = os.stat(full_path).st_size
+            except FileNotFoundError:
                 files_generated += 1
+            else:
+                if existing_size == len(data) and self._has_same_content(full_path, data):
+                    files_unchanged += 1
+                    continue
+                files_modified += 1
             
             # Write file
             try:
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                with open(full_path, 'wb') as f:
+                    f.write(data)
                 logger.debug(f"💾 Saved: {file_path}")
             except Exception as e:
                 logger.error(f"❌ Error saving {file_path}: {e}")
         
-        logger.info(f"✅ Unified save complete: {files_generated} generated, {files_modified} modified")
+        if files_generated or files_modified:
+            self._load_cache.pop(os.fspath(structure["project_path"]), None)
+        
+        logger.info(f"✅ Unified save complete: {files_generated} generated, {files_modified} modified, {files_unchanged} unchanged")
         return files_generated, files_modified
     
-    def load_from_unified_structure(self, structure: Dict[str, Path]) -> Optional[Dict[str, str]]:
+    def _has_same_content(self, full_path: str, data: bytes) -> bool:
+        """Check whether a file on disk already holds exactly these bytes"""
+        try:
+            with open(full_path, 'rb', buffering=0) as f:
+                return f.read() == data
+        except OSError:
+            return False
+    
+    def _resolve_target_path(self, structure: Dict[str, Path], file_path: str, project_prefix: str) -> str:
+        """Map an organized file path to its location in the unified structure (plain string path)"""
+        if file_path.startswith("env_test/"):
+            # Save to env_test/
+            return os.path.join(structure["env_test_path"], file_path[9:])  # Remove "env_test/"
+        
+        if file_path.startswith(project_prefix):
+            # Save to project-{name}/
+            return os.path.join(structure["project_path"], file_path[len(project_prefix)+1:])  # Remove "project-{name}/"
+        
+        if file_path in ["requirements.txt", ".env.template", ".gitignore"]:
+            # Root support files
+            return os.path.join(structure["base_path"], file_path)
+        
+        # Default to project path
+        return os.path.join(structure["project_path"], file_path)
+    
+    def load_from_unified_structure(self, structure: Dict[str, Path], read_only: bool = False) -> Optional[Mapping]:
         """
         📖 LOAD FROM UNIFIED STRUCTURE - Always from project-{name}/
         Returns dict of relative_path -> content
+        With read_only=True a read-only view of the cached tree is returned instead of a copy
         """
-        project_path = structure["project_path"]
+        root = os.fspath(structure["project_path"])
         
-        if not project_path.exists():
-            logger.warning(f"Project path not found: {project_path}")
+        try:
+            root_stat = os.stat(root)
+        except FileNotFoundError:
+            root_stat = None
+        if root_stat is None or not stat.S_ISDIR(root_stat.st_mode):
+            logger.warning(f"Project path not found: {root}")
             return None
         
-        files = {}
+        prefix_length = len(root) + 1
         try:
-            for file_path in project_path.rglob("*"):
-                if file_path.is_file():
-                    relative_path = str(file_path.relative_to(project_path))
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            files[relative_path] = f.read()
-                        logger.debug(f"📖 Loaded: {relative_path}")
-                    except Exception as e:
-                        logger.warning(f"Could not read {relative_path}: {e}")
+            # In-place rewrites and changes in subdirectories leave the root's mtime
+            # alone, so every file's (size, mtime_ns) is compared with the last load
+            signatures = {
+                file_path[prefix_length:]: signature for file_path, signature in _scandir_files(root)
+            }
+            cached_signatures, cached_files = self._load_cache.get(root, ({}, {}))
+            
+            # Nothing changed since the last load (e.g. validation of the previous iteration)
+            if root in self._load_cache and signatures == cached_signatures:
+                logger.info(f"✅ Reusing {len(cached_files)} files loaded from unified structure")
+                return MappingProxyType(cached_files) if read_only else cached_files.copy()
             
-            logger.info(f"✅ Loaded {len(files)} files from unified structure")
-            return files
+            # Only new or changed files are read; all reads are queued at once
+            to_read = [
+                relative_path for relative_path, signature in signatures.items()
+                if cached_signatures.get(relative_path) != signature
+            ]
+            results = dict(zip(to_read, _read_executor.map(
+                _read_text_file, [os.path.join(root, relative_path) for relative_path in to_read]
+            )))
+            
+            files = {}
+            undecodable = 0
+            for relative_path in signatures:
+                result = results.get(relative_path)
+                if result is None:
+                    # Unchanged: reuse the content (unchanged undecodable files stay skipped)
+                    if relative_path in cached_files:
+                        files[relative_path] = cached_files[relative_path]
+                    continue
+                content, error = result
+                if error is None:
+                    files[relative_path] = content
+                elif isinstance(error, UnicodeDecodeError):
+                    undecodable += 1
+                else:
+                    logger.warning(f"Could not read {relative_path}: {error}")
+            if undecodable:
+                logger.debug(f"Skipped {undecodable} non-UTF-8 files")
+            
+            logger.info(f"✅ Loaded {len(files)} files from unified structure ({len(to_read)} read from disk)")
+            # The cached dict is never modified, so read-only views of it stay consistent
+            self._remember_load(root, signatures, files)
+            return MappingProxyType(files) if read_only else files.copy()
             
         except Exception as e:
             logger.error(f"❌ Error loading from unified structure: {e}")
             return None
     
+    def _remember_load(self,
+                       root: str,
+                       signatures: Dict[str, Tuple[int, int]],
+                       files: Dict[str, str]) -> None:
+        """Keep a loaded tree for the next load of the same root, evicting the oldest entry"""
+        self._load_cache.pop(root, None)
+        if len(self._load_cache) >= LOAD_CACHE_MAX_ENTRIES:
+            self._load_cache.pop(next(iter(self._load_cache)))
+        self._load_cache[root] = (signatures, files)
+    
     def get_structure_info(self, structure: Dict[str, Path]) -> Dict[str, Any]:
         """
         📊 GET STRUCTURE INFO - Statistics and validation
@@ -182,6 +316,7 @@ class UnifiedStructureManager:
         try:
             # Clean project code (but keep directory)
             project_path = structure["project_path"]
+            self._load_cache.pop(os.fspath(project_path), None)
             if project_path.exists():
                 for item in project_path.iterdir():
                     try:
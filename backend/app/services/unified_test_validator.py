@@ -5,11 +5,31 @@ import asyncio
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+def _read_report(path: Path) -> Any:
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _write_reports(reports: List[Tuple[Path, Any]]) -> None:
+    for path, report in reports:
+        if orjson is not None:
+            data = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(report, indent=2).encode('utf-8')
+        path.write_bytes(data)
+
+
 class UnifiedTestValidator:
     """
     🧪 UNIFIED TEST VALIDATOR
@@ -669,14 +689,16 @@ class UnifiedTestValidator:
                 })
         
         # Critical compilation errors
-        for error in compilation_report["errors"]:
-            critical_errors.append({
+        critical_errors.extend([
+            {
                 "type": "compilation",
                 "category": error.get("error_type", "unknown"),
                 "message": error["message"],
                 "suggestion": error.get("suggestion", ""),
                 "priority": "high"
-            })
+            }
+            for error in compilation_report["errors"]
+        ])
         
         # Failed tests
         for test_detail in test_results["test_details"]:
@@ -787,23 +809,16 @@ class UnifiedTestValidator:
         reports_path = structure["reports_path"]
         
         try:
-            # Save individual reports
-            validation_file = reports_path / f"validation_iter_{iteration}.json"
-            with open(validation_file, 'w') as f:
-                json.dump(result["validation_report"], f, indent=2)
-            
-            compilation_file = reports_path / f"compilation_iter_{iteration}.json"
-            with open(compilation_file, 'w') as f:
-                json.dump(result["compilation_report"], f, indent=2)
-            
-            test_file = reports_path / f"test_results_iter_{iteration}.json"
-            with open(test_file, 'w') as f:
-                json.dump(result["test_results"], f, indent=2)
+            # Individual reports plus the comprehensive iteration summary
+            reports = [
+                (reports_path / f"validation_iter_{iteration}.json", result["validation_report"]),
+                (reports_path / f"compilation_iter_{iteration}.json", result["compilation_report"]),
+                (reports_path / f"test_results_iter_{iteration}.json", result["test_results"]),
+                (reports_path / f"iteration_{iteration}.json", result),
+            ]
             
-            # Save comprehensive iteration summary
-            summary_file = reports_path / f"iteration_{iteration}.json"
-            with open(summary_file, 'w') as f:
-                json.dump(result, f, indent=2)
+            # One worker thread call for the whole batch, off the event loop
+            await asyncio.to_thread(_write_reports, reports)
             
             logger.info(f"💾 Validation reports saved to {reports_path}")
             
@@ -818,8 +833,7 @@ class UnifiedTestValidator:
         summary_file = reports_path / f"iteration_{previous_iteration}.json"
         if summary_file.exists():
             try:
-                with open(summary_file, 'r') as f:
-                    summary = json.load(f)
+                summary = _read_report(summary_file)
                 
                 # Extract critical errors from analysis
                 if "analysis" in summary and "critical_errors" in summary["analysis"]:
@@ -864,8 +878,7 @@ class UnifiedTestValidator:
                 
                 # Load latest report
                 latest_file = reports_path / f"iteration_{summary['latest_iteration']}.json"
-                with open(latest_file, 'r') as f:
-                    latest_report = json.load(f)
+                latest_report = _read_report(latest_file)
                 
                 summary["current_status"] = "success" if latest_report.get("success", False) else "issues"
                 summary["remaining_critical_errors"] = len(latest_report.get("analysis", {}).get("critical_errors", []))
@@ -873,8 +886,7 @@ class UnifiedTestValidator:
                 # Calculate trend if multiple iterations
                 if len(iteration_numbers) >= 2:
                     first_file = reports_path / f"iteration_{iteration_numbers[0]}.json"
-                    with open(first_file, 'r') as f:
-                        first_report = json.load(f)
+                    first_report = _read_report(first_file)
                     
                     first_errors = len(first_report.get("analysis", {}).get("critical_errors", []))
                     latest_errors = summary["remaining_critical_errors"]
@@ -246,7 +246,6 @@ Formato risposta JSON:
             )
             
             # Prova a parsare come JSON
-            import json
             suggestions_data = json.loads(response)
             return suggestions_data.get("suggestions", [])
         
@@ -1,15 +1,29 @@
 # backend/app/services/updated_orchestrator.py
 import logging
 import asyncio
+import time
+import json
+from datetime import datetime
 from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
 
 from app.services.llm_service import LLMService
 from app.services.code_generator import CodeGenerator
 from app.services.unified_orchestration_manager import UnifiedOrchestrationManager
+from app.services.llm_response_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between stat() calls on the STOP_REQUESTED file
+STOP_CHECK_INTERVAL = 0.5
+
+# Requirement keywords -> extra improvement focus area
+IMPROVEMENT_FOCUS_KEYWORDS = (
+    (("authentication", "auth"), "security"),
+    (("database", "db"), "performance"),
+    (("api",), "documentation"),
+)
+
 class UpdatedOrchestratorAgent:
     """
     🔥 UPDATED ORCHESTRATOR - Using Unified Components
@@ -20,14 +34,24 @@ class UpdatedOrchestratorAgent:
     Focus: Complex projects with multiple iterations and intelligent error fixing
     """
     
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, response_cache: Optional[LLMResponseCache] = None):
         self.llm_service = llm_service
         self.code_generator = CodeGenerator(llm_service)
         
         # 🎯 UNIFIED COMPONENTS
         self.unified_manager = UnifiedOrchestrationManager()
         
+        # Identical generation inputs (e.g. a retried run) are answered from here
+        # when the caller passes a cache; without one nothing is persisted and only
+        # concurrent identical requests are shared
+        self.response_cache = response_cache if response_cache is not None else LLMResponseCache(max_entries=0)
+        
         self.stop_requested = False
+        self._last_stop_check = float("-inf")
+        
+        # Lower-cased requirements text, computed once per generation run
+        self._requirements_source: Optional[Dict[str, Any]] = None
+        self._requirements_text_lower = ""
         
         # Enhanced Generator support
         try:
@@ -55,7 +79,8 @@ class UpdatedOrchestratorAgent:
         
         # Check for stop request
         stop_file = project_path / "STOP_REQUESTED"
-        if stop_file.exists():
+        self._last_stop_check = float("-inf")
+        if self._stop_requested(stop_file):
             logger.info(f"Stop file found for project {project_path.name}, stopping generation")
             return {"status": "stopped", "reason": "user_requested"}
         
@@ -67,7 +92,9 @@ class UpdatedOrchestratorAgent:
             project_name = f"project_{project_path.name}"
         
         # 🎯 CREATE UNIFIED STRUCTURE (replaces all iter-X logic)
-        structure = self.unified_manager.create_project_structure(project_path, project_name)
+        structure = await asyncio.to_thread(
+            self.unified_manager.create_project_structure, project_path, project_name
+        )
         logger.info(f"🏗️ Unified structure created for: {structure['project_name']}")
         
         # Track project state
@@ -85,7 +112,7 @@ class UpdatedOrchestratorAgent:
             logger.info(f"🔄 Starting enhanced iteration {iteration} for {structure['project_name']}")
             
             # Check for stop request
-            if stop_file.exists() or self.stop_requested:
+            if self._stop_requested(stop_file):
                 logger.info("Stop requested, interrupting generation")
                 return {
                     "status": "stopped",
@@ -98,13 +125,10 @@ class UpdatedOrchestratorAgent:
             
             try:
                 # Update current iteration in project.json
-                self._update_current_iteration(project_path, iteration)
-                
-                # Progress callback
-                if progress_callback:
-                    progress_callback(iteration, f'enhanced_unified_iteration_{iteration}')
+                await asyncio.to_thread(self._update_current_iteration, project_path, iteration)
                 
                 # 🔧 GENERATE CODE (orchestrator-specific logic)
+                # One update per phase: each is a round trip to the result backend
                 if progress_callback:
                     progress_callback(iteration, 'generating_enhanced_code')
                 
@@ -113,8 +137,8 @@ class UpdatedOrchestratorAgent:
                 )
                 
                 # 📁 ORGANIZE AND SAVE (unified system)
-                files_generated, files_modified = self.unified_manager.organize_and_save_files(
-                    structure, code_files, requirements
+                files_generated, files_modified = await asyncio.to_thread(
+                    self.unified_manager.organize_and_save_files, structure, code_files, requirements
                 )
                 
                 logger.info(f"✅ Enhanced iteration {iteration}: Generated {files_generated} files, modified {files_modified}")
@@ -215,46 +239,79 @@ class UpdatedOrchestratorAgent:
         
         if iteration == 1:
             # First iteration: generate from requirements
-            return await self._generate_initial_enhanced_code(requirements, provider)
+            cache_key = self.response_cache.make_key("initial_code", provider, requirements)
+            return await self.response_cache.get_or_call(
+                cache_key,
+                lambda: self._generate_initial_enhanced_code(requirements, provider),
+                model=provider
+            )
         else:
             # Subsequent iterations: load previous files and apply fixes/improvements
-            existing_files = self.unified_manager.load_previous_files(structure)
-            previous_errors = self.unified_manager.load_previous_errors(structure, iteration - 1)
+            # Off the event loop, so other generations keep running during the reads
+            existing_files, previous_errors = await asyncio.gather(
+                asyncio.to_thread(self.unified_manager.load_previous_files, structure),
+                asyncio.to_thread(self.unified_manager.load_previous_errors, structure, iteration - 1)
+            )
             
             if previous_errors and existing_files:
                 logger.info(f"🔧 Found {len(previous_errors)} errors from previous iteration")
-                
-                # Enhanced Generator fixing if available
-                if self.has_enhanced_generator and len(previous_errors) > 0:
-                    logger.info("⚡ Using Enhanced Generator for intelligent error fixing")
-                    try:
-                        fixed_files = await self.enhanced_code_generator.fix_issues(
-                            code_files=existing_files,
-                            issues=previous_errors,
-                            provider=provider,
-                            context={
-                                "iteration": iteration,
-                                "project_type": requirements.get("project", {}).get("type", "fullstack"),
-                                "tech_stack": requirements.get("tech_stack", {}),
-                                "structure_type": "unified"
-                            }
-                        )
-                        logger.info("✅ Enhanced Generator fixed issues successfully")
-                        return fixed_files
-                        
-                    except Exception as e:
-                        logger.warning(f"Enhanced Generator fixing failed: {e}, falling back to standard fixing")
-                        
-                # Fallback to standard fixing
-                return await self._generate_enhanced_fixes(
-                    requirements, provider, previous_errors, existing_files, iteration
+                cache_key = self.response_cache.make_key(
+                    "fixes", provider, requirements, iteration, previous_errors, existing_files
+                )
+                return await self.response_cache.get_or_call(
+                    cache_key,
+                    lambda: self._fix_previous_errors(
+                        requirements, provider, previous_errors, existing_files, iteration
+                    ),
+                    model=provider
                 )
             else:
                 logger.info("🎨 No previous errors found, generating enhanced improvements")
-                return await self._generate_enhanced_improvements(
-                    requirements, provider, existing_files or {}, iteration
+                existing_files = existing_files or {}
+                cache_key = self.response_cache.make_key(
+                    "improvements", provider, requirements, iteration, files=existing_files
+                )
+                return await self.response_cache.get_or_call(
+                    cache_key,
+                    lambda: self._generate_enhanced_improvements(
+                        requirements, provider, existing_files, iteration
+                    ),
+                    model=provider
                 )
 
+    async def _fix_previous_errors(self,
+                                   requirements: Dict[str, Any],
+                                   provider: str,
+                                   previous_errors: List[Dict[str, Any]],
+                                   existing_files: Dict[str, str],
+                                   iteration: int) -> Dict[str, str]:
+        """Fix the previous iteration's errors, with the Enhanced Generator when available"""
+        # Enhanced Generator fixing if available
+        if self.has_enhanced_generator and len(previous_errors) > 0:
+            logger.info("⚡ Using Enhanced Generator for intelligent error fixing")
+            try:
+                fixed_files = await self.enhanced_code_generator.fix_issues(
+                    code_files=existing_files,
+                    issues=previous_errors,
+                    provider=provider,
+                    context={
+                        "iteration": iteration,
+                        "project_type": requirements.get("project", {}).get("type", "fullstack"),
+                        "tech_stack": requirements.get("tech_stack", {}),
+                        "structure_type": "unified"
+                    }
+                )
+                logger.info("✅ Enhanced Generator fixed issues successfully")
+                return fixed_files
+                
+            except Exception as e:
+                logger.warning(f"Enhanced Generator fixing failed: {e}, falling back to standard fixing")
+                
+        # Fallback to standard fixing
+        return await self._generate_enhanced_fixes(
+            requirements, provider, previous_errors, existing_files, iteration
+        )
+
     async def _generate_initial_enhanced_code(self, 
                                             requirements: Dict[str, Any], 
                                             provider: str) -> Dict[str, str]:
@@ -343,33 +400,40 @@ class UpdatedOrchestratorAgent:
         base_focus = iteration_focus.get(iteration, ["code_quality"])
         
         # Add requirements-based focus
-        req_str = str(requirements).lower()
-        if "authentication" in req_str or "auth" in req_str:
-            base_focus.append("security")
-        if "database" in req_str or "db" in req_str:
-            base_focus.append("performance")
-        if "api" in req_str:
-            base_focus.append("documentation")
+        req_str = self._get_requirements_text(requirements)
+        for keywords, focus in IMPROVEMENT_FOCUS_KEYWORDS:
+            if any(keyword in req_str for keyword in keywords):
+                base_focus.append(focus)
         
-        return list(set(base_focus))  # Remove duplicates
+        return list(dict.fromkeys(base_focus))  # Remove duplicates, keep order
+    
+    def _get_requirements_text(self, requirements: Dict[str, Any]) -> str:
+        """Lower-cased requirements text, serialized once per requirements object"""
+        if self._requirements_source is not requirements:
+            self._requirements_source = requirements
+            self._requirements_text_lower = json.dumps(requirements, default=str).lower()
+        return self._requirements_text_lower
     
     def _update_current_iteration(self, project_path: Path, iteration: int):
         """Update current iteration in project.json"""
         try:
-            project_json_path = project_path / "project.json"
-            if project_json_path.exists():
-                import json
-                with open(project_json_path, 'r') as f:
-                    project_data = json.load(f)
-                
-                project_data["current_iteration"] = iteration
-                project_data["structure_type"] = "unified"
-                
-                with open(project_json_path, 'w') as f:
-                    json.dump(project_data, f, indent=2)
+            self.unified_manager.update_project_json(project_path, {
+                "current_iteration": iteration,
+                "structure_type": "unified"
+            })
         except Exception as e:
             logger.error(f"Error updating project.json: {str(e)}")
     
+    def _stop_requested(self, stop_file: Path) -> bool:
+        """Stop flag or STOP_REQUESTED file; the file is stat'ed at most every STOP_CHECK_INTERVAL"""
+        if self.stop_requested:
+            return True
+        now = time.monotonic()
+        if now - self._last_stop_check < STOP_CHECK_INTERVAL:
+            return False
+        self._last_stop_check = now
+        return stop_file.exists()
+    
     def request_stop(self):
         """Set the stop flag to request stopping generation"""
         logger.info("Stop requested for UpdatedOrchestratorAgent")
@@ -477,5 +541,4 @@ class UpdatedOrchestratorAgent:
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp"""
-        from datetime import datetime
         return datetime.now().isoformat()
\ No newline at end of file
@@ -1,4 +1,5 @@
 # backend/app/services/workspace_environment.py
+import json
 import subprocess
 import shutil
 import os
@@ -226,7 +227,6 @@ class TestingEnvironment:
         
         package_json_path = self.testing_path / "package.json"
         with open(package_json_path, 'w') as f:
-            import json
             json.dump(minimal_package, f, indent=2)
         
         logger.info("Created minimal package.json for testing")
@@ -13,6 +13,13 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# uvloop comes with uvicorn[standard]; use it for the asyncio.run() calls below when available
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Create Celery app
 celery = Celery('tasks',
                 broker=settings.REDIS_URL,
@@ -49,6 +56,13 @@ celery.conf.update(
     result_persistent=True,
 )
 
+async def _run_and_close(llm_service, coro):
+    """Await coro, then close llm_service's connection pools in the same event loop"""
+    try:
+        return await coro
+    finally:
+        await llm_service.aclose()
+
 # Gestione dell'interruzione dei task
 @task_revoked.connect
 def handle_revoked_task(sender=None, request=None, terminated=None, signum=None, expired=None, **kwargs):
@@ -127,7 +141,8 @@ def process_multi_agent_generation(self,
             )
         
         # Esegui la generazione multi-agent
-        result = asyncio.run(
+        result = asyncio.run(_run_and_close(
+            llm_service,
             orchestrator.generate_multi_agent_application(
                 requirements=requirements,
                 provider=llm_provider,
@@ -135,7 +150,7 @@ def process_multi_agent_generation(self,
                 project_path=project_path,
                 progress_callback=progress_callback
             )
-        )
+        ))
         
         # Aggiorna lo stato finale
         if result["status"] == "completed":
@@ -172,19 +187,19 @@ def process_multi_agent_generation(self,
 
 # 🔥 AGGIORNATO: Task enhanced che ora supporta tutti gli agent modes
 @celery.task(bind=True)
-def process_enhanced_code_generation(self, project_id: str, llm_provider: str, max_iterations: int = 10, agent_mode: str = "updated_orchestrator"):
+def process_enhanced_code_generation(self, project_id: str, llm_provider: str, max_iterations: int = 10, agent_mode: str = "updated_orchestrator", refresh_cache: bool = False):
     """
     🔥 AGGIORNATO: Task enhanced che supporta routing intelligente tra tutti gli agent modes
     Supporta: original, enhanced_generator, updated_orchestrator, multi_agent
+    refresh_cache=True rigenera senza riusare le risposte LLM in cache
     """
     import asyncio
-    return asyncio.run(_async_process_enhanced_code_generation(self, project_id, llm_provider, max_iterations, agent_mode))
+    return asyncio.run(_async_process_enhanced_code_generation(self, project_id, llm_provider, max_iterations, agent_mode, refresh_cache))
 
 
-async def _async_process_enhanced_code_generation(self, project_id: str, llm_provider: str, max_iterations: int, agent_mode: str):
+async def _async_process_enhanced_code_generation(self, project_id: str, llm_provider: str, max_iterations: int, agent_mode: str, refresh_cache: bool = False):
     from datetime import datetime
     from pathlib import Path
-    import json
     import logging
 
     project_path = Path(f"output/{project_id}")
@@ -217,7 +232,9 @@ async def _async_process_enhanced_code_generation(self, project_id: str, llm_pro
         )
 
     from app.services.llm_service import LLMService
+    from app.services.llm_response_cache import LLMResponseCache
     llm_service = LLMService()
+    response_cache = LLMResponseCache(refresh=refresh_cache)
 
     # 🔥 ROUTING INTELLIGENTE: Seleziona il generatore basato su agent_mode
     try:
@@ -225,7 +242,7 @@ async def _async_process_enhanced_code_generation(self, project_id: str, llm_pro
             logger.info("Using Enhanced Code Generator for moderate complexity project")
             
             from app.services.enhanced_orchestrator_wrapper import EnhancedGeneratorWrapper
-            wrapper = EnhancedGeneratorWrapper(llm_service)
+            wrapper = EnhancedGeneratorWrapper(llm_service, response_cache=response_cache)
             
             # Genera usando il metodo principale del Enhanced Generator
             result = await wrapper.generate_application_with_enhanced_flow(
@@ -274,7 +291,7 @@ async def _async_process_enhanced_code_generation(self, project_id: str, llm_pro
             logger.info("Using Updated Orchestrator for complex project")
             
             from app.services.updated_orchestrator import UpdatedOrchestratorAgent
-            orchestrator = UpdatedOrchestratorAgent(llm_service)
+            orchestrator = UpdatedOrchestratorAgent(llm_service, response_cache=response_cache)
             
             result = await orchestrator.generate_application_with_enhanced_flow(
                 requirements=requirements,
@@ -289,7 +306,7 @@ async def _async_process_enhanced_code_generation(self, project_id: str, llm_pro
             logger.info("Using Multi-Agent system for enterprise project")
             
             from app.services.multi_agent_orchestrator import MultiAgentOrchestrator
-            orchestrator = MultiAgentOrchestrator(llm_service)
+            orchestrator = MultiAgentOrchestrator(llm_service, response_cache=response_cache)
             
             result = await orchestrator.generate_multi_agent_application(
                 requirements=requirements,
@@ -319,7 +336,7 @@ async def _async_process_enhanced_code_generation(self, project_id: str, llm_pro
             logger.warning(f"Unknown agent_mode: {agent_mode}, falling back to updated_orchestrator")
             
             from app.services.updated_orchestrator import UpdatedOrchestratorAgent
-            orchestrator = UpdatedOrchestratorAgent(llm_service)
+            orchestrator = UpdatedOrchestratorAgent(llm_service, response_cache=response_cache)
             
             result = await orchestrator.generate_application_with_enhanced_flow(
                 requirements=requirements,
@@ -406,6 +423,10 @@ async def _async_process_enhanced_code_generation(self, project_id: str, llm_pro
             "project_id": project_id,
             "generation_strategy": agent_mode
         }
+    
+    finally:
+        # The task's event loop ends here, so its connection pools go with it
+        await llm_service.aclose()
 
 # 🔥 NUOVO: Task per ottenere riassunto test
 @celery.task
@@ -449,7 +470,6 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
     """
     try:
         # Importazioni necessarie
-        import json
         import logging
         import asyncio
         from pathlib import Path
@@ -504,7 +524,8 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
             orchestrator = MultiAgentOrchestrator(llm_service)
             
             # Usa il metodo corretto generate_multi_agent_application
-            result = asyncio.run(
+            result = asyncio.run(_run_and_close(
+                llm_service,
                 orchestrator.generate_multi_agent_application(
                     requirements=requirements,
                     provider=llm_provider,
@@ -512,7 +533,7 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
                     project_path=project_path,
                     progress_callback=progress_callback
                 )
-            )
+            ))
             
         elif agent_mode == "updated_orchestrator":
             # Sistema con orchestratore migliorato
@@ -520,7 +541,8 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
             orchestrator = UpdatedOrchestratorAgent(llm_service)
             
             # Usa il metodo corretto
-            result = asyncio.run(
+            result = asyncio.run(_run_and_close(
+                llm_service,
                 orchestrator.generate_application_with_enhanced_flow(
                     requirements=requirements,
                     provider=llm_provider,
@@ -528,7 +550,7 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
                     project_path=project_path,
                     progress_callback=progress_callback
                 )
-            )
+            ))
             
         elif agent_mode == "enhanced_generator":
             # Generator singolo migliorato
@@ -536,13 +558,14 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
             generator = EnhancedCodeGenerator(llm_service)
             
             # Usa il metodo corretto
-            result = asyncio.run(
+            result = asyncio.run(_run_and_close(
+                llm_service,
                 generator.generate_complete_project_enhanced(
                     requirements=requirements,
                     provider=llm_provider,
                     max_iterations=max_iterations
                 )
-            )
+            ))
             
         elif agent_mode == "original":
             # Sistema originale
@@ -550,7 +573,8 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
             generator = CodeGenerator(llm_service=llm_service)
             
             # Usa il metodo corretto
-            result = asyncio.run(
+            result = asyncio.run(_run_and_close(
+                llm_service,
                 generator.generate_application_with_testing(
                     requirements=requirements,
                     provider=llm_provider,
@@ -558,7 +582,7 @@ def process_agent_generation(self, project_id, llm_provider="openai", max_iterat
                     project_path=project_path,
                     progress_callback=progress_callback
                 )
-            )
+            ))
             
         else:
             logger.error(f"Unknown agent mode: {agent_mode}")
@@ -648,7 +672,8 @@ def process_code_generation(self,
             )
         
         # Use orchestrator instead of manual loop
-        result = asyncio.run(
+        result = asyncio.run(_run_and_close(
+            llm_service,
             orchestrator.generate_application_with_orchestration(
                 requirements=requirements,
                 provider=llm_provider,
@@ -656,7 +681,7 @@ def process_code_generation(self,
                 project_path=project_path,
                 progress_callback=progress_callback
             )
-        )
+        ))
         
         # Update final status
         if result["status"] == "completed":
@@ -903,6 +928,10 @@ async def _async_process_unified_generation(self,
             "project_id": project_id,
             "generation_strategy": generation_strategy
         }
+    
+    finally:
+        # The task's event loop ends here, so its connection pools go with it
+        await llm_service.aclose()
         
 def _calculate_performance_metrics(project_data: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
         """🔥 Calculate performance metrics for Enhanced V2"""
@@ -0,0 +1,71 @@
+# backend/tests/test_enhanced_code_generator.py
+import asyncio
+
+import pytest
+
+from app.services.enhanced_code_generator import _limited_as_completed
+
+class TestLimitedAsCompleted:
+    """Test dell'esecuzione concorrente limitata delle richieste di fix"""
+
+    @pytest.mark.asyncio
+    async def test_yields_every_result_within_the_limit(self):
+        """Test che tutti i risultati arrivino senza superare il limite di concorrenza"""
+        running = 0
+        peak = 0
+
+        async def work(value):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (value % 3))
+            running -= 1
+            return value
+
+        results = [result async for result in _limited_as_completed((work(i) for i in range(10)), 3)]
+
+        assert sorted(results) == list(range(10))
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_coroutines_are_created_only_when_a_slot_frees(self):
+        """Test che le coroutine vengano create solo quando si libera uno slot"""
+        created = []
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        def coros():
+            for i in range(5):
+                created.append(i)
+                yield work(i)
+
+        iterator = _limited_as_completed(coros(), 2)
+        first = await iterator.__anext__()
+
+        assert first in (0, 1)
+        assert len(created) == 3
+        await iterator.aclose()
+
+    @pytest.mark.asyncio
+    async def test_remaining_tasks_are_cancelled_on_error(self):
+        """Test che un errore cancelli le richieste ancora in corso"""
+        cancelled = []
+
+        async def fail():
+            raise ValueError("fix fallito")
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with pytest.raises(ValueError):
+            async for _ in _limited_as_completed([fail(), slow()], 2):
+                pass
+        await asyncio.sleep(0)
+
+        assert cancelled == [True]
@@ -0,0 +1,253 @@
+# backend/tests/test_llm_response_cache.py
+import asyncio
+import itertools
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.services import llm_response_cache
+from app.services.llm_response_cache import LLMResponseCache
+
+REQUIREMENTS = {
+    "project": {"name": "Shop", "type": "fullstack"},
+    "backend": {"framework": "fastapi", "database": "postgresql"},
+    "features": [{"authentication": {"providers": ["email"]}}, {"cart": {}}],
+    "notes": "prima bozza"
+}
+
+class TestLLMResponseCacheKeys:
+    """Test della stabilità delle chiavi di cache"""
+
+    def test_key_ignores_dict_order_whitespace_and_notes(self):
+        """Test che ordine delle chiavi, spazi e note non cambino la chiave"""
+        cache = LLMResponseCache(db_path=":memory:", ttl_seconds=60, max_entries=10)
+        reordered = {
+            "notes": "versione rivista",
+            "features": [{"authentication": {"providers": [" email "]}}, {"cart": {}}],
+            "backend": {"database": "postgresql", "framework": "fastapi"},
+            "project": {"type": "fullstack", "name": "Shop"}
+        }
+
+        assert cache.make_key("initial_code", "openai", REQUIREMENTS) == \
+            cache.make_key("initial_code", "openai", reordered)
+
+    def test_key_changes_with_semantic_differences(self):
+        """Test che stack, database, feature e provider producano chiavi diverse"""
+        cache = LLMResponseCache(db_path=":memory:", ttl_seconds=60, max_entries=10)
+        base = cache.make_key("initial_code", "openai", REQUIREMENTS)
+
+        other_database = {**REQUIREMENTS, "backend": {"framework": "fastapi", "database": "mysql"}}
+        fewer_features = {**REQUIREMENTS, "features": REQUIREMENTS["features"][:1]}
+
+        assert cache.make_key("initial_code", "openai", other_database) != base
+        assert cache.make_key("initial_code", "openai", fewer_features) != base
+        assert cache.make_key("initial_code", "anthropic", REQUIREMENTS) != base
+        assert cache.make_key("improvements", "openai", REQUIREMENTS, iteration=2, files={}) != base
+
+    def test_nested_comment_fields_are_significant(self):
+        """Test che una feature o tabella "comments" non venga scartata come nota"""
+        cache = LLMResponseCache(db_path=":memory:", ttl_seconds=60, max_entries=10)
+        with_comments = {
+            **REQUIREMENTS,
+            "features": REQUIREMENTS["features"] + [{"comments": {"moderation": True}}],
+            "database": {"tables": {"comments": ["id", "body"]}}
+        }
+        without_comments = {**REQUIREMENTS, "database": {"tables": {}}}
+
+        assert cache.make_key("initial_code", "openai", with_comments) != \
+            cache.make_key("initial_code", "openai", without_comments)
+        assert cache.make_key("initial_code", "openai", with_comments) != \
+            cache.make_key("initial_code", "openai", {**with_comments, "database": {"tables": {}}})
+
+    def test_files_digest_ignores_mapping_order(self):
+        """Test che l'ordine dei file non cambi la chiave"""
+        cache = LLMResponseCache(db_path=":memory:", ttl_seconds=60, max_entries=10)
+        files = {"a.py": "print(1)", "b.py": "print(2)"}
+
+        assert cache.make_key("fixes", "openai", REQUIREMENTS, 2, [], files) == \
+            cache.make_key("fixes", "openai", REQUIREMENTS, 2, [], dict(reversed(files.items())))
+
+class TestLLMResponseCacheStorage:
+    """Test di scadenza, eviction e gestione errori del database"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "cache" / "responses.sqlite3")
+
+    @pytest.fixture
+    def clock(self):
+        """time.time() che avanza di un secondo a ogni chiamata"""
+        with patch.object(llm_response_cache.time, "time", side_effect=itertools.count(1000).__next__):
+            yield
+
+    def test_entries_expire_after_ttl(self, db_path):
+        """Test che una risposta oltre il TTL sia un miss"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+
+        with patch.object(llm_response_cache.time, "time", return_value=1000.0):
+            cache._set("key", {"main.py": "print(1)"}, "gpt")
+        with patch.object(llm_response_cache.time, "time", return_value=1030.0):
+            assert cache._get("key") == {"main.py": "print(1)"}
+        with patch.object(llm_response_cache.time, "time", return_value=1061.0):
+            assert cache._get("key") is None
+
+    def test_least_recently_used_entries_are_evicted(self, db_path, clock):
+        """Test che oltre max_entries venga rimossa la voce usata meno di recente"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=3600, max_entries=2)
+
+        cache._set("a", {"a.py": "a"}, None)
+        cache._set("b", {"b.py": "b"}, None)
+        assert cache._get("a") is not None  # "a" diventa la più recente
+        cache._set("c", {"c.py": "c"}, None)
+
+        assert cache._get("b") is None
+        assert cache._get("a") == {"a.py": "a"}
+        assert cache._get("c") == {"c.py": "c"}
+
+    def test_disabled_cache_never_stores(self, db_path):
+        """Test che max_entries=0 disabiliti la cache"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=0)
+
+        asyncio.run(cache.set("key", {"main.py": "x"}))
+
+        assert asyncio.run(cache.get("key")) is None
+        assert not Path(db_path).exists()
+
+    def test_corrupt_database_is_a_miss(self, db_path):
+        """Test che un file di database corrotto non interrompa la generazione"""
+        Path(db_path).parent.mkdir(parents=True)
+        Path(db_path).write_bytes(b"questo non e' un database sqlite" * 64)
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            return {"main.py": "print(1)"}
+
+        result = asyncio.run(cache.get_or_call("key", generate))
+
+        assert result == {"main.py": "print(1)"}
+        assert len(calls) == 1
+
+    def test_locked_database_is_a_miss(self, db_path):
+        """Test che un database bloccato da un altro worker sia trattato come miss"""
+        Path(db_path).parent.mkdir(parents=True)
+        holder = sqlite3.connect(db_path)
+        holder.execute("CREATE TABLE other (x)")
+        holder.execute("BEGIN EXCLUSIVE")
+        try:
+            with patch.object(llm_response_cache, "SQLITE_BUSY_TIMEOUT", 0.05):
+                cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+                calls = []
+
+                async def generate():
+                    calls.append(1)
+                    return {"main.py": "print(1)"}
+
+                result = asyncio.run(cache.get_or_call("key", generate))
+        finally:
+            holder.rollback()
+            holder.close()
+
+        assert result == {"main.py": "print(1)"}
+        assert len(calls) == 1
+
+class TestLLMResponseCacheGetOrCall:
+    """Test di get_or_call: riuso, single flight e refresh"""
+
+    @pytest.fixture
+    def db_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield str(Path(temp_dir) / "responses.sqlite3")
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self, db_path):
+        """Test che la stessa generazione non richiami l'LLM"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            return {"main.py": "print(1)"}
+
+        first = await cache.get_or_call("key", generate)
+        second = await cache.get_or_call("key", generate)
+
+        assert first == second == {"main.py": "print(1)"}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_cached(self, db_path):
+        """Test che un fallback vuoto venga ritentato"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            return {}
+
+        await cache.get_or_call("key", generate)
+        await cache.get_or_call("key", generate)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_generation(self, db_path):
+        """Test che chiamate concorrenti con la stessa chiave facciano una sola richiesta"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+        calls = []
+        release = asyncio.Event()
+
+        async def generate():
+            calls.append(1)
+            await release.wait()
+            return {"main.py": "print(1)"}
+
+        tasks = [asyncio.create_task(cache.get_or_call("key", generate)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert results == [{"main.py": "print(1)"}] * 3
+        # Chi si unisce riceve una copia, non l'oggetto del primo chiamante
+        assert results[0] is not results[1]
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_propagates_to_joiners(self, db_path):
+        """Test che un errore della generazione condivisa arrivi a tutti i chiamanti"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+        release = asyncio.Event()
+
+        async def generate():
+            await release.wait()
+            raise RuntimeError("provider down")
+
+        tasks = [asyncio.create_task(cache.get_or_call("key", generate)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not cache._inflight
+
+    @pytest.mark.asyncio
+    async def test_refresh_ignores_and_replaces_cached_output(self, db_path):
+        """Test che refresh=True rigeneri e aggiorni la voce in cache"""
+        cache = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10)
+
+        async def old():
+            return {"main.py": "vecchio"}
+
+        async def new():
+            return {"main.py": "nuovo"}
+
+        await cache.get_or_call("key", old)
+        refreshing = LLMResponseCache(db_path=db_path, ttl_seconds=60, max_entries=10, refresh=True)
+
+        assert await refreshing.get_or_call("key", new) == {"main.py": "nuovo"}
+        assert await cache.get("key") == {"main.py": "nuovo"}
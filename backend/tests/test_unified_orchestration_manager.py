@@ -0,0 +1,67 @@
+# backend/tests/test_unified_orchestration_manager.py
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.services.unified_orchestration_manager import UnifiedOrchestrationManager
+
+class TestUpdateProjectJson:
+    """Test dell'aggiornamento atomico di project.json"""
+
+    @pytest.fixture
+    def project_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            with open(project_path / "project.json", "w") as f:
+                json.dump({"id": "shop", "status": "processing", "current_iteration": 1}, f, indent=2)
+            yield project_path
+
+    def test_merges_updates_and_keeps_other_fields(self, project_path):
+        """Test che i campi aggiornati vengano uniti a quelli esistenti"""
+        manager = UnifiedOrchestrationManager()
+
+        assert manager.update_project_json(project_path, {"current_iteration": 2, "status": "completed"})
+
+        data = json.loads((project_path / "project.json").read_text())
+        assert data == {"id": "shop", "status": "completed", "current_iteration": 2}
+
+    def test_written_compact_regardless_of_log_level(self, project_path, caplog):
+        """Test che il formato su disco non dipenda dal livello di log"""
+        manager = UnifiedOrchestrationManager()
+
+        with caplog.at_level("DEBUG"):
+            manager.update_project_json(project_path, {"current_iteration": 2})
+
+        content = (project_path / "project.json").read_text()
+        assert "\n" not in content
+        assert json.loads(content)["current_iteration"] == 2
+
+    def test_external_changes_are_not_overwritten(self, project_path):
+        """Test che le modifiche fatte da altri processi vengano rilette"""
+        manager = UnifiedOrchestrationManager()
+        manager.update_project_json(project_path, {"current_iteration": 2})
+
+        # Un altro processo (es. l'API) aggiorna il file nel frattempo
+        data = json.loads((project_path / "project.json").read_text())
+        data["task_id"] = "task-123"
+        (project_path / "project.json").write_text(json.dumps(data, indent=2))
+        stat = (project_path / "project.json").stat()
+        os.utime(project_path / "project.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        manager.update_project_json(project_path, {"current_iteration": 3})
+
+        data = json.loads((project_path / "project.json").read_text())
+        assert data["task_id"] == "task-123"
+        assert data["current_iteration"] == 3
+
+    def test_missing_project_json_returns_false(self):
+        """Test che senza project.json non venga creato nulla"""
+        manager = UnifiedOrchestrationManager()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert manager.update_project_json(Path(temp_dir), {"status": "completed"}) is False
+            assert not (Path(temp_dir) / "project.json").exists()
+            assert os.listdir(temp_dir) == []
@@ -0,0 +1,91 @@
+# backend/tests/test_unified_structure_manager.py
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.services.unified_structure_manager import UnifiedStructureManager
+
+class TestLoadFromUnifiedStructure:
+    """Test del caricamento dei file dalla struttura unificata"""
+
+    @pytest.fixture
+    def project_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir) / "project-test"
+            (project_path / "backend").mkdir(parents=True)
+            (project_path / "backend" / "main.py").write_text("print('ciao')\n", encoding="utf-8")
+            (project_path / "README.md").write_text("# Progetto è pronto\n", encoding="utf-8")
+            # File non UTF-8: deve essere ignorato, non esposto come chiave illeggibile
+            (project_path / "legacy.csv").write_bytes("città;perché\n".encode("latin-1"))
+            yield project_path
+
+    def test_read_only_skips_undecodable_files(self, project_path):
+        """Test che ogni chiave esposta sia leggibile anche con file latin-1 nel progetto"""
+        manager = UnifiedStructureManager()
+        files = manager.load_from_unified_structure({"project_path": project_path}, read_only=True)
+
+        assert set(files) == {"backend/main.py", "README.md"}
+        assert "legacy.csv" not in files
+        assert len(files) == 2
+        # Contratto Mapping: ogni chiave iterata è accessibile
+        assert {path: files[path] for path in files} == dict(files.items())
+        assert files["README.md"] == "# Progetto è pronto\n"
+
+    def test_read_only_view_cannot_modify_cache(self, project_path):
+        """Test che la vista condivisa non permetta di alterare la cache"""
+        manager = UnifiedStructureManager()
+        structure = {"project_path": project_path}
+        files = manager.load_from_unified_structure(structure, read_only=True)
+
+        with pytest.raises(TypeError):
+            files["backend/main.py"] = "modificato"
+
+        copied = manager.load_from_unified_structure(structure)
+        copied["backend/main.py"] = "modificato"
+
+        reloaded = manager.load_from_unified_structure(structure, read_only=True)
+        assert reloaded["backend/main.py"] == "print('ciao')\n"
+
+    def test_eager_load_matches_read_only(self, project_path):
+        """Test che il caricamento completo e la vista contengano gli stessi file"""
+        structure = {"project_path": project_path}
+        eager = UnifiedStructureManager().load_from_unified_structure(structure)
+        view = UnifiedStructureManager().load_from_unified_structure(structure, read_only=True)
+
+        assert eager == dict(view)
+        assert "legacy.csv" not in eager
+
+    def test_files_changed_by_others_are_reloaded(self, project_path):
+        """Test che modifiche esterne in-place e nelle sottocartelle vengano rilette"""
+        manager = UnifiedStructureManager()
+        structure = {"project_path": project_path}
+        (project_path / "src").mkdir()
+        (project_path / "src" / "a.py").write_text("a = 1\n", encoding="utf-8")
+        manager.load_from_unified_structure(structure, read_only=True)
+
+        # Riscritture in-place: la mtime della root del progetto non cambia
+        for relative_path, content in (("backend/main.py", "print('modificato')\n"), ("src/a.py", "a = 2\n")):
+            file_path = project_path / relative_path
+            old_stat = file_path.stat()
+            file_path.write_text(content, encoding="utf-8")
+            os.utime(file_path, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns + 1_000_000_000))
+        (project_path / "src" / "b.py").write_text("b = 1\n", encoding="utf-8")
+
+        files = manager.load_from_unified_structure(structure, read_only=True)
+
+        assert files["backend/main.py"] == "print('modificato')\n"
+        assert files["src/a.py"] == "a = 2\n"
+        assert files["src/b.py"] == "b = 1\n"
+        assert files["README.md"] == "# Progetto è pronto\n"
+
+    def test_deleted_files_are_dropped(self, project_path):
+        """Test che un file cancellato non venga più restituito dalla cache"""
+        manager = UnifiedStructureManager()
+        structure = {"project_path": project_path}
+        manager.load_from_unified_structure(structure)
+
+        (project_path / "backend" / "main.py").unlink()
+
+        assert "backend/main.py" not in manager.load_from_unified_structure(structure)